@@ -0,0 +1,60 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+import concurrent.futures
+from typing import Coroutine
+
+from common.logger import getmylogger
+from common.zmqutils import Transport, Endpoint
+from common.zmqasync import AsyncLoopThread, AsyncZmqSub
+
+class AsyncBridgeQt(QObject):
+    """
+    Qt side of the shared AsyncLoopThread. Coroutines run on the asyncio thread,
+    their results and streamed message batches come back as queued Qt signals.
+    """
+    resultSig = pyqtSignal(object)
+    errorSig = pyqtSignal(str)
+    batchSig = pyqtSignal(list) # [(topic, payload bytes, timestamp), ...] from subscribe()
+    def __init__(self):
+        super().__init__()
+        self.log = getmylogger(__name__)
+        self.runner = AsyncLoopThread.instance()
+        self.futures: set[concurrent.futures.Future] = set()
+
+    def run(self, coro: Coroutine) -> concurrent.futures.Future:
+        future = self.runner.submit(coro)
+        self.futures.add(future)
+        future.add_done_callback(self._onDone)
+        return future
+
+    def _onDone(self, future: concurrent.futures.Future):
+        # Runs on the asyncio thread, signals are queued to the GUI thread
+        self.futures.discard(future)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.errorSig.emit(str(error))
+        else:
+            self.resultSig.emit(future.result())
+
+    def subscribe(self, transport: Transport, endpoint: Endpoint, topics: tuple[str, ...]) -> concurrent.futures.Future:
+        """Stream topics into batchSig until the returned future is cancelled or stop() is called."""
+        return self.run(self._stream(transport, endpoint, topics))
+
+    async def _stream(self, transport: Transport, endpoint: Endpoint, topics: tuple[str, ...]):
+        sub = AsyncZmqSub(transport=transport, endpoint=endpoint)
+        for topic in topics:
+            sub.addTopicSub(topic)
+        sub.connect()
+        try:
+            while True:
+                batch = await sub.receive_batch(timeout=None)
+                if batch:
+                    self.batchSig.emit(batch)
+        finally:
+            sub.close()
+
+    def stop(self):
+        for future in list(self.futures):
+            future.cancel()
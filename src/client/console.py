@@ -1,12 +1,13 @@
 from PyQt6 import QtCore
 from PyQt6.QtCore import Qt, pyqtSlot
-from PyQt6.QtWidgets import QFrame, QTabWidget, QPushButton, QGridLayout, QWidget, QTextEdit, QVBoxLayout, QListWidget, QStackedLayout, QHBoxLayout, QListWidgetItem, QLabel, QLineEdit
+from PyQt6.QtWidgets import QFrame, QTabWidget, QPushButton, QGridLayout, QWidget, QTextEdit, QVBoxLayout, QListWidget, QStackedLayout, QHBoxLayout, QListWidgetItem, QLabel, QLineEdit, QCheckBox
 
-from client.zmqQtBridge import ZmqBridgeQt
+from client.zmqQtBridge import ZmqBridgeQt, BATCH_PERIOD_MS
 from client.menus import DataSeriesTableSettings, DataSeriesTable, SettingsUI
 
 from common.logger import getmylogger
 from common.messages import TopicMap
+from common.telemHub import TelemBlock, SINK_HWM
 from common.config import ConsoleAppCfg, ConsoleCfg
 from common.zmqutils import Transport, Endpoint
 
@@ -42,7 +43,8 @@ class ConsoleApp(QFrame):
         grid.addWidget(self.clear_PB, 2, 0, 1, 1)
 
     def newConsole(self, consoleCfg: ConsoleCfg):
-        console = Console(topicMap=self.topicMap, subscritions=consoleCfg.protocol, name=consoleCfg.name)
+        console = Console(topicMap=self.topicMap, subscritions=consoleCfg.protocol, name=consoleCfg.name,
+                          hwm=consoleCfg.hwm, conflate=consoleCfg.conflate)
         self.consoles.append(console)
         self.tabs.addTab(console, console.name)
 
@@ -63,7 +65,8 @@ class ConsoleApp(QFrame):
             print("Settings")
 
 class Console(QWidget):
-    def __init__(self, topicMap: TopicMap,  subscritions: tuple[str, ...], name: str = "Console"):
+    def __init__(self, topicMap: TopicMap,  subscritions: tuple[str, ...], name: str = "Console",
+                 hwm: int = SINK_HWM, conflate: bool = False):
         super().__init__()
         self.log = getmylogger(__name__)
         self.name = name
@@ -71,14 +74,15 @@ class Console(QWidget):
         self.topics = subscritions
 
         self.initUI()
-        self.zmqBridge = ZmqBridgeQt(topicMap=self.topicMap, transport=Transport.TCP, endpoint=Endpoint.BOT_MSG)
+        self.zmqBridge = ZmqBridgeQt(topicMap=self.topicMap, transport=Transport.TCP, endpoint=Endpoint.BOT_MSG,
+                                     batchPeriodMs=BATCH_PERIOD_MS, hwm=hwm, conflate=conflate)
         self.zmqBridge.registerSubscriptions(self.topics)
-        self.zmqBridge.msgSig.connect(self._updateData)
-        self.zmqBridge.workerIO._begin()
+        self.zmqBridge.blockSig.connect(self._updateBlock)
+        self.zmqBridge.start()
                
     def closeEvent(self, event):
         self.log.info(f"Closing Console {self.name}")
-        self.zmqBridge.workerIO._stop()  # stop device thread
+        self.zmqBridge.stop()  # detach from the telemetry hub
         event.accept()
 
     def initUI(self):
@@ -101,13 +105,16 @@ class Console(QWidget):
         self.consoleText.clear()
 
     @QtCore.pyqtSlot(tuple)
-    def _updateData(self, msg: tuple[str, str]):
-        topic, data = msg
+    def _updateBlock(self, blocks: tuple[TelemBlock, ...]):
         if(isinstance(self.consoleText.document, QTextEdit)):
             if self.consoleText.document().lineCount() > 200:
                 self.consoleText.clear()
 
-        self.consoleText.append(topic +"    "+data)  # add data to console tab spaced
+        lines = list()
+        for block in blocks:
+            for row in block.data.tolist():
+                lines.extend(f"{name}    {value}" for name, value in zip(block.names, row))
+        self.consoleText.append("\n".join(lines))  # one append per block, tab spaced
 
 """ ----------------- Console App Settings ----------------- """
 
@@ -194,6 +201,9 @@ class ConsoleSettings(SettingsUI):
     def initUI(self):
         self.consoleName = QLineEdit(self.config.name)
         self.sampleBuffer = QLineEdit(str(self.config.sampleBufferLen))
+        self.hwm = QLineEdit(str(self.config.hwm))
+        self.conflate = QCheckBox("Latest Only")
+        self.conflate.setChecked(self.config.conflate)
         self.table = DataSeriesTable()
         self.table.loadSubscriptions(self.config.protocol)
 
@@ -202,13 +212,18 @@ class ConsoleSettings(SettingsUI):
         grid.addWidget(self.consoleName, 0, 1)
         grid.addWidget(QLabel("Sample Buffer:"), 1, 0)
         grid.addWidget(self.sampleBuffer, 1, 1)
-        grid.addWidget(self.table, 2, 0, 1, 2)
+        grid.addWidget(QLabel("High Water Mark:"), 2, 0)
+        grid.addWidget(self.hwm, 2, 1)
+        grid.addWidget(self.conflate, 3, 1)
+        grid.addWidget(self.table, 4, 0, 1, 2)
         self.setLayout(grid)
 
 
     def updateConfig(self):
         self.config.name = self.consoleName.text()
         self.config.sampleBufferLen = int(self.sampleBuffer.text())
+        self.config.hwm = int(self.hwm.text())
+        self.config.conflate = self.conflate.isChecked()
         self.config.protocol = self.table.grabSubscriptions()
 
         
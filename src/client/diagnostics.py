@@ -0,0 +1,83 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QFrame, QGridLayout, QPushButton, QTableWidget, QTableWidgetItem, QCheckBox
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
+import numpy as np
+
+from common.logger import getmylogger
+from common.latency import LatencyMonitor, LATENCY_STAGES, LATENCY_BIN_EDGES, STATS_TOPIC
+
+DIAGNOSTICS_PERIOD_MS = 1000
+
+class DiagnosticsApp(QFrame):
+    """
+    Per stage latency of the telemetry path, robot timestamp to pixel.
+    Refreshes once a second and republishes the summary on STATS_TOPIC.
+    """
+    COLUMNS = ("count", "p50", "p99", "p999", "max")
+    def __init__(self):
+        super().__init__()
+        self.log = getmylogger(__name__)
+        self.setWindowTitle("Diagnostics")
+        self.monitor = LatencyMonitor.instance()
+        self.initUI()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(DIAGNOSTICS_PERIOD_MS)
+
+    def initUI(self):
+        self.table = QTableWidget(len(LATENCY_STAGES), len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels([self.COLUMNS[0]] + [f"{c} (ms)" for c in self.COLUMNS[1:]])
+        self.table.setVerticalHeaderLabels(LATENCY_STAGES)
+        self.fig = plt.figure()
+        self.ax = self.fig.add_subplot(1, 1, 1)
+        self.ax.set_xscale("log")
+        self.ax.set_xlabel("Latency (ms)")
+        self.ax.set_ylabel("Samples")
+        self.centres = np.sqrt(LATENCY_BIN_EDGES[:-1] * LATENCY_BIN_EDGES[1:]) * 1e3 # geometric bin centres, ms
+        self.lines = {stage: self.ax.plot([], [], label=stage, drawstyle="steps-mid", linewidth=0.75)[0]
+                      for stage in LATENCY_STAGES}
+        self.ax.legend(loc=1)
+        self.canvas = FigureCanvas(self.fig)
+        self.publishBox = QCheckBox(f"Publish on {STATS_TOPIC}")
+        self.publishBox.setChecked(True)
+        self.resetBtn = QPushButton("Reset")
+        self.resetBtn.clicked.connect(self.reset)
+
+        grid = QGridLayout()
+        grid.addWidget(self.table, 0, 0, 1, 2)
+        grid.addWidget(self.canvas, 1, 0, 1, 2)
+        grid.addWidget(self.publishBox, 2, 0)
+        grid.addWidget(self.resetBtn, 2, 1)
+        self.setLayout(grid)
+
+    def refresh(self):
+        snapshot = self.monitor.snapshot()
+        peak = 1
+        for row, stage in enumerate(LATENCY_STAGES):
+            counts, summary = snapshot[stage]
+            self.table.setItem(row, 0, QTableWidgetItem(str(summary["count"])))
+            for col, key in enumerate(self.COLUMNS[1:], start=1):
+                self.table.setItem(row, col, QTableWidgetItem(f"{summary[key] * 1e3:.3f}"))
+            inner = counts[1:-1] # under / overflow have no bin centre
+            self.lines[stage].set_data(self.centres, inner)
+            peak = max(peak, int(inner.max()))
+        self.ax.set_xlim(self.centres[0], self.centres[-1])
+        self.ax.set_ylim(0, peak * 1.05)
+        self.canvas.draw_idle()
+        if self.publishBox.isChecked():
+            try:
+                self.monitor.publish()
+            except Exception as e:
+                self.log.error(f"Disabling stats publishing: {e}")
+                self.publishBox.setChecked(False)
+
+    def reset(self):
+        self.monitor.reset()
+        self.refresh()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.monitor.close()
+        event.accept()
@@ -0,0 +1,88 @@
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+import sys
+import multiprocessing
+from queue import Empty
+from typing import Optional
+
+from common.logger import getmylogger
+from common.export import FigureSnapshot, exportProcess
+import common.exportMain
+
+EXPORT_POLL_MS = 100
+
+class ExportService(QObject):
+    """
+    Renders FigureSnapshots in a spawned process, one job at a time.
+    The GUI thread only polls the progress queue, telemetry keeps flowing while
+    a large figure or a time-lapse is written.
+    spawn re-imports the parent's __main__ in the child, common.exportMain stands
+    in for it while the process starts so the child never imports the GUI.
+    """
+    progressSig = pyqtSignal(int, int) # done, total
+    finishedSig = pyqtSignal(str) # path
+    failedSig = pyqtSignal(str) # reason
+    def __init__(self):
+        super().__init__()
+        self.log = getmylogger(__name__)
+        self.context = multiprocessing.get_context("spawn") # forking a process with Qt threads is unsafe
+        self.process: Optional[multiprocessing.Process] = None
+        self.queue = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self._poll)
+
+    def busy(self) -> bool:
+        return self.process is not None
+
+    def export(self, snapshot: FigureSnapshot, path: str) -> bool:
+        """Start rendering snapshot to path, False while another export is running."""
+        if self.busy():
+            self.log.warning("Export already running")
+            return False
+        self.queue = self.context.Queue()
+        self.process = self.context.Process(target=exportProcess, args=(snapshot, path, self.queue), daemon=True)
+        main = sys.modules["__main__"]
+        sys.modules["__main__"] = common.exportMain # read by spawn's preparation data only
+        try:
+            self.process.start()
+        finally:
+            sys.modules["__main__"] = main
+        self.timer.start(EXPORT_POLL_MS)
+        self.log.info(f"Exporting {path}")
+        return True
+
+    def cancel(self):
+        if self.process is not None:
+            self.process.terminate()
+            self._finish()
+            self.failedSig.emit("Export cancelled")
+
+    def _poll(self):
+        alive = self.process.is_alive() # before draining, a dead process has flushed its queue
+        while True:
+            try:
+                msg = self.queue.get_nowait()
+            except Empty:
+                break
+            if msg[0] == "progress":
+                self.progressSig.emit(msg[1], msg[2])
+            elif msg[0] == "done":
+                self._finish()
+                self.log.info(f"Exported {msg[1]}")
+                self.finishedSig.emit(msg[1])
+                return
+            else:
+                self._finish()
+                self.log.error(f"Export failed {msg[1]}")
+                self.failedSig.emit(msg[1])
+                return
+        if not alive:
+            code = self.process.exitcode
+            self._finish()
+            self.failedSig.emit(f"Export process exited with code {code}")
+
+    def _finish(self):
+        self.timer.stop()
+        self.process.join(timeout=1)
+        self.process = None
+        self.queue = None
@@ -2,22 +2,24 @@ from PyQt6.QtWidgets import QFrame, QTabWidget, QVBoxLayout, QScrollArea, QWidge
 from PyQt6.QtCore import pyqtSignal
 
 
-from functools import partial
-
-
 from client.menus import ProgressBar
+from client.asyncQt import AsyncBridgeQt
 from common.logger import getmylogger
-from core.commander import ZMQCommander
+from core.commander import AsyncZMQCommander
 
 class ParamTableApp(QFrame):
     """
     Generic Parameter Table App - Implements GET SET on Parameters
     Each Nodes Parameters are displayed in a tab
+    Commands are sent from the shared AsyncLoopThread, a slow socket never stalls the GUI
     """
-    def __init__(self, cmdr: ZMQCommander):
+    def __init__(self, cmdr: AsyncZMQCommander):
         super().__init__()
         self.log = getmylogger(__name__)
         self.cmdr = cmdr
+        self.bridge = AsyncBridgeQt()
+        self.bridge.resultSig.connect(self.result_handle)
+        self.bridge.errorSig.connect(self.error_handle)
         self.tabs = QTabWidget()  
         self.tabs.setTabsClosable(False)
         self.nodeTabs = []
@@ -34,20 +36,35 @@ class ParamTableApp(QFrame):
             for paramUI in paramTable.paramTable:
                 if isinstance(paramUI, ParamRegUI):
                     paramUI.get_btn.clicked.connect(
-                        partial(self.cmdr.sendGetCmd, nodeID=node_name, paramName=paramUI.label.text()))
+                        lambda checked, node=node_name, pui=paramUI: self.get_handle(node, pui.label.text()))
                     paramUI.set_btn.clicked.connect(
-                        lambda checked, pui=paramUI: self.cmdr.sendSetCmd(
-                            nodeID=self.tabs.tabText(self.tabs.currentIndex()),
-                            paramName=pui.label.text(),
-                            value=pui.value_entry.text()
-                        )
-                    )
+                        lambda checked, pui=paramUI: self.set_handle(
+                            self.tabs.tabText(self.tabs.currentIndex()), pui.label.text(), pui.value_entry.text()))
         vbox = QVBoxLayout()
         vbox.addWidget(self.tabs)
         self.setLayout(vbox)
         
+    def get_handle(self, nodeID: str, paramName: str):
+        self.bridge.run(self._command("GET", nodeID, paramName, self.cmdr.sendGetCmd(nodeID, paramName)))
+
+    def set_handle(self, nodeID: str, paramName: str, value: str):
+        self.bridge.run(self._command("SET", nodeID, paramName, self.cmdr.sendSetCmd(nodeID, paramName, value)))
+
+    async def _command(self, kind: str, nodeID: str, paramName: str, send) -> tuple[str, str, str, bool]:
+        return kind, nodeID, paramName, await send
+
+    def result_handle(self, result: tuple[str, str, str, bool]):
+        kind, nodeID, paramName, sent = result
+        if not sent:
+            self.log.error(f"{kind} failed, unknown parameter {nodeID}/{paramName}")
+
+    def error_handle(self, message: str):
+        self.log.error(f"Command error {message}")
+
     def closeEvent(self, event):
         self.log.info("Closing ParamTable")
+        self.bridge.stop()
+        self.bridge.runner.callSoon(self.cmdr.close) # the socket is used on the asyncio thread, closed there too
         event.accept() 
 
 class ParamTable(QWidget):
@@ -1,29 +1,42 @@
 from PyQt6 import QtCore
 from PyQt6.QtCore import Qt, pyqtSlot, QThread, QTimer
-from PyQt6.QtWidgets import QFrame, QTabWidget, QGridLayout, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QListWidget, QStackedLayout, QDialog, QDialogButtonBox, QListWidgetItem
+from PyQt6.QtWidgets import QFrame, QTabWidget, QGridLayout, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QComboBox, QPushButton, QListWidget, QStackedLayout, QDialog, QDialogButtonBox, QListWidgetItem, QCheckBox, QFileDialog, QProgressBar
 import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.animation as animation
 
-from client.zmqQtBridge import ZmqBridgeQt
+from client.zmqQtBridge import ZmqBridgeQt, BATCH_PERIOD_MS
 from client.menus import DataSeriesTable, DataSeriesTableSettings, SettingsUI
+from client.renderScheduler import RenderScheduler
+from client.exportService import ExportService
 
 from common.logger import getmylogger
-from common.config import LinePlotCfg, ScatterPlotCfg, BarPlotCfg
+from common.config import LinePlotCfg, ScatterPlotCfg, BarPlotCfg, DashboardPlotCfg
 from common.config import PlotCfg, PlotAppCfg, PlotTypeMap
 
 from common.zmqutils import ZmqPub, ZmqSub, Endpoint, Transport
 
+import time
+import math
 import numpy as np
+from typing import Optional
 
 from common.messages import TopicMap
+from common.telemHub import TelemBlock
+from common.telemStore import TelemetryStore
+from common.ringBuffer import RingBuffer
+from common.decimate import decimate, DECIMATION_METHODS
+from common.latency import LatencyMonitor, LATENCY_ENABLED
+from common.export import FigureSnapshot, ArtistSnapshot
 
 from common.utils import check_darkmode
 
-if(check_darkmode()):
-    plt.style.use('dark_background')
-else:
-    plt.style.use('bmh')
+PLOT_LIMIT_MARGIN = 0.1 # headroom added when data leaves the axis range
+SCATTER_MARKER_SIZE = 4
+EXPORT_FILTER = "Images (*.png *.svg *.pdf);;Time-lapse (*.mp4 *.gif)"
+
+PLOT_THEME = 'dark_background' if check_darkmode() else 'bmh'
+plt.style.use(PLOT_THEME)
 
 
 """ ----------------- Plot App ----------------- """
@@ -35,10 +48,19 @@ class PlotApp(QFrame):
         self.topicMap = topicMap
         self.config = config
         self.plots = list()  # List of plot instances
+        RenderScheduler.instance().setTargetFps(self.config.targetFps)
+        self.exportService = ExportService()
+        self.exportService.progressSig.connect(self.export_progress_handle)
+        self.exportService.finishedSig.connect(self.export_done_handle)
+        self.exportService.failedSig.connect(self.export_done_handle)
         self.initUI()
         
+        members = {name for plotCfg in self.config.plotConfigs if isinstance(plotCfg.typeCfg, DashboardPlotCfg)
+                   for name in plotCfg.typeCfg.members}
         for plotCfg in self.config.plotConfigs:
-            self.newPlot(plotCfg) 
+            if plotCfg.name in members:
+                continue # drawn on its dashboard instead of its own tab
+            self.newPlot(plotCfg)
 
     def closeEvent(self, event):
         for plot in self.plots:
@@ -52,60 +74,238 @@ class PlotApp(QFrame):
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_plt_handle)
         self.tabs.setTabPosition(QTabWidget.TabPosition.South)
+        self.exportBtn = QPushButton("Export")
+        self.exportBtn.clicked.connect(self.export_handle)
+        self.exportProgress = QProgressBar()
+        self.exportProgress.hide()
         self.grid = QGridLayout()
         self.grid.addWidget(self.tabs, 1, 0, 4, 4)
+        self.grid.addWidget(self.exportBtn, 5, 0)
+        self.grid.addWidget(self.exportProgress, 5, 1, 1, 3)
         self.setLayout(self.grid)
 
     def newPlot(self, plotCfg: PlotCfg):
-        if plotCfg.plotType == "LINE":
-            plot = LinePlot(topicMap=self.topicMap, config=plotCfg,
-                            transport=Transport.TCP, endpoint=Endpoint.BOT_MSG)
+        if isinstance(plotCfg.typeCfg, DashboardPlotCfg):
+            byName = {cfg.name: cfg for cfg in self.config.plotConfigs}
+            members = [byName[name] for name in plotCfg.typeCfg.members if name in byName]
+            plot = DashboardPlot(topicMap=self.topicMap, config=plotCfg, members=members,
+                                 transport=Transport.TCP, endpoint=Endpoint.BOT_MSG)
         else:
-            raise NotImplementedError("Plot Type not implemented")
+            plotClass = PlotClassMap.get(plotCfg.plotType)
+            if plotClass is None:
+                raise NotImplementedError("Plot Type not implemented")
+            plot = plotClass(topicMap=self.topicMap, config=plotCfg,
+                             transport=Transport.TCP, endpoint=Endpoint.BOT_MSG)
 
         self.plots.append(plot)      
         self.tabs.addTab(plot, plot.config.name)
 
     def close_plt_handle(self, index):
-        pass  # Callback for closing a plot
+        plot = self.tabs.widget(index)
+        self.tabs.removeTab(index)
+        if plot in self.plots:
+            self.plots.remove(plot)
+            plot.close()
+
+    def export_handle(self):
+        plot = self.tabs.currentWidget()
+        if not isinstance(plot, (BasePlot, DashboardPlot)):
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Plot", f"{plot.config.name}.png", EXPORT_FILTER)
+        if path and self.exportService.export(plot.snapshot(), path):
+            self.exportProgress.setValue(0)
+            self.exportProgress.show()
+
+    def export_progress_handle(self, done: int, total: int):
+        self.exportProgress.setMaximum(total)
+        self.exportProgress.setValue(done)
+
+    def export_done_handle(self, msg: str):
+        self.exportProgress.hide()
+
+def expandRange(current: tuple[float, float], views: list[np.ndarray]) -> Optional[tuple[float, float]]:
+    """Grown (lo, hi) when finite data leaves current, None while everything still fits."""
+    views = [v for v in views if len(v)]
+    if not views:
+        return None
+    lo = min(float(np.fmin.reduce(v)) for v in views) # fmin / fmax skip NaN
+    hi = max(float(np.fmax.reduce(v)) for v in views)
+    cmin, cmax = current
+    if not (lo < cmin or hi > cmax): # also None when everything is NaN
+        return None
+    lo, hi = min(lo, cmin), max(hi, cmax)
+    margin = PLOT_LIMIT_MARGIN * (hi - lo)
+    return (lo - margin if lo < cmin else cmin, hi + margin if hi > cmax else cmax)
 
 class BasePlot(QFrame):
-    """Base class for plotting."""
-    def __init__(self, topicMap, transport: Transport, endpoint: Endpoint):
+    """
+    Base class for plotting. Series are read from the shared TelemetryStore, the
+    conflated bridge only wakes the plot. Owns the blitted render path, subclasses
+    push series data into self.artists. Given axes the plot is embedded in another
+    figure, e.g. a DashboardPlot, which then owns the canvas and the render pass.
+    """
+    def __init__(self, topicMap, transport: Transport, endpoint: Endpoint, axes: Optional[Axes] = None):
         super().__init__()
+        self.axes = axes
         self.config = PlotCfg()
         self.log = getmylogger(__name__)
-        self.zmqBridge = ZmqBridgeQt(topicMap=topicMap, transport=transport, endpoint=endpoint)
-        self.zmqBridge.msgSig.connect(self._updateData)
+        self.topicMap = topicMap
+        self.transport = transport
+        self.endpoint = endpoint
+        self.store = TelemetryStore.instance()
+        self.zmqBridge = ZmqBridgeQt(topicMap=topicMap, transport=transport, endpoint=endpoint,
+                                     batchPeriodMs=BATCH_PERIOD_MS, conflate=True) # the store keeps every sample
+        self.zmqBridge.blockSig.connect(self._updateBlock)
+        self.latency = LatencyMonitor.instance()
+        self.undrawnSince = None # perf_counter of the oldest block not yet drawn
+        self.dataSet: dict[str, RingBuffer] = dict() # plot local (t, v) series, e.g. from drawLineOnPlot
+        self.clearedAt: dict[str, float] = dict() # store series cleared by clearData, samples up to this time are hidden
+        self.artists = list() # animated, drawn over the cached background
+        self.dirty = False # set by new data, cleared by render()
+        self.background = None # canvas without the animated artists, recached on every full draw
+        self.pixelWidth = 1000 # axes width in pixels, updated on every full draw
+        self.scheduler = RenderScheduler.instance()
+
+    def initUI(self):
+        """Initializes the plot UI."""
+        if self.axes is not None: # embedded, drawn by the host
+            self.ax = self.axes
+            self.fig = self.axes.figure
+            self.canvas = self.fig.canvas
+            return
+        self.fig = plt.figure()
+        self.ax = self.fig.add_subplot(1, 1, 1)
+        self.ax.grid(linestyle='dashed', linewidth=0.5)
+        self.canvas = FigureCanvas(self.fig)
+        self.canvas.mpl_connect("draw_event", self._onDraw)
+        layout = QGridLayout()
+        layout.addWidget(self.canvas, 0, 0, 5, 5)
+        self.setLayout(layout)
+        self.setContentsMargins(0, 0, 0, 0)
+
+    def startStream(self):
+        """Store config.protocol and attach to the hub, call once config is final."""
+        self.store.subscribe(self.topicMap, self.config.protocol, self.transport, self.endpoint,
+                             capacity=self.config.sampleBufferLen)
+        self.zmqBridge.registerSubscriptions(self.config.protocol)
+        self.zmqBridge.start()
+        if self.axes is None:
+            self.scheduler.register(self)
 
     @QtCore.pyqtSlot(tuple)
-    def _updateData(self, msg: tuple[str, str]):
-        raise NotImplementedError("Subclasses must implement updateData method")
-    
+    def _updateBlock(self, blocks: tuple[TelemBlock, ...]):
+        if self.undrawnSince is None:
+            self.undrawnSince = time.perf_counter()
+        self.dirty = True
+
+    def _series(self, label: str, n: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        """Newest n (t, v) of a series as views, plot local series shadow the store."""
+        ring = self.dataSet.get(label)
+        if ring is not None:
+            return ring.view(n)
+        ts, ys = self.store.last(label, n)
+        tCleared = self._clearedAt(label)
+        if tCleared is not None:
+            i0 = np.searchsorted(ts, tCleared, side="right")
+            ts, ys = ts[i0:], ys[i0:]
+        return ts, ys
+
+    def _pair(self, xLabel: str, yLabel: str, n: Optional[int] = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Newest n (t, x, y), fields of one store topic come from one view so the rows pair up."""
+        aligned = None
+        if xLabel not in self.dataSet and yLabel not in self.dataSet:
+            aligned = self.store.lastAligned((xLabel, yLabel), n)
+        if aligned is not None:
+            ts, xs, ys = aligned
+            tCleared = max((t for t in (self._clearedAt(xLabel), self._clearedAt(yLabel)) if t is not None), default=None)
+            i0 = 0 if tCleared is None else np.searchsorted(ts, tCleared, side="right")
+            return ts[i0:], xs[i0:], ys[i0:]
+        ts, xs = self._series(xLabel, n) # different topics, pair the newest samples of each
+        ys = self._series(yLabel, n)[1]
+        n = min(len(xs), len(ys))
+        return ts[len(ts) - n:], xs[len(xs) - n:], ys[len(ys) - n:]
+
+    def _timeScale(self, label: str) -> float:
+        """Timestamp units -> seconds from the series' topic, plot local series count samples."""
+        entry = self.store.series.get(label)
+        return entry[0].topic.timeScale if entry is not None and label not in self.dataSet else 1.0
+
+    def _clearedAt(self, label: str) -> Optional[float]:
+        """Time a store series was cleared at, None when it was not or the publisher clock restarted since."""
+        tCleared = self.clearedAt.get(label)
+        if tCleared is not None and self.store.lastTime(label) < tCleared: # store history was reset
+            del self.clearedAt[label]
+            return None
+        return tCleared
+
+    def _updateArtists(self) -> bool:
+        """Push buffered data into self.artists, True when the limits moved and a full redraw is needed."""
+        raise NotImplementedError("Subclasses must implement _updateArtists method")
+
+    def _onDraw(self, event):
+        # Full redraws land here, cache the static background then overlay the animated artists
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.pixelWidth = max(1, int(self.ax.bbox.width))
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        self._markDrawn()
+
+    def _markDrawn(self):
+        if LATENCY_ENABLED and self.undrawnSince is not None:
+            self.latency.record("draw", np.array([time.perf_counter() - self.undrawnSince]))
+        self.undrawnSince = None
+
+    def hidden(self):
+        """Called by the scheduler instead of render() while off screen, data keeps buffering."""
+        self.undrawnSince = None # nothing is waiting on a pixel, keep the draw stage honest
+
+    def render(self):
+        """Blit the artists if anything changed, full redraw only when the limits move."""
+        if not self.dirty:
+            return
+        self.dirty = False
+        fullDraw = self._updateArtists() or self.background is None
+        if fullDraw:
+            self.canvas.draw() # draw_event recaches the background
+            return
+        self.canvas.restore_region(self.background)
+        for artist in self.artists:
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+        self._markDrawn()
+
+    def _snapshotArtists(self) -> list[ArtistSnapshot]:
+        raise NotImplementedError("Subclasses must implement _snapshotArtists method")
+
+    def snapshot(self) -> FigureSnapshot:
+        """Full resolution copy of what the plot shows, for ExportService."""
+        return FigureSnapshot(title=self.config.name, xlabel=self.ax.get_xlabel(), ylabel=self.ax.get_ylabel(),
+                              xlim=self.ax.get_xlim(), ylim=self.ax.get_ylim(), artists=self._snapshotArtists(),
+                              theme=PLOT_THEME)
+
     def close(self):
         self.log.debug(f"Closing Plot {self.config.name}")
-        self.zmqBridge.workerIO._stop()  # Stop the device thread
+        self.scheduler.unregister(self)
+        self.zmqBridge.stop()  # Detach from the telemetry hub
+        self.store.release(self.transport, self.endpoint)
 
 class LinePlot(BasePlot):
     """Class for line plotting."""
-    def __init__(self, topicMap, config: PlotCfg, transport: Transport, endpoint: Endpoint):
-        super().__init__(topicMap=topicMap, transport=transport, endpoint=endpoint)
+    def __init__(self, topicMap, config: PlotCfg, transport: Transport, endpoint: Endpoint, axes: Optional[Axes] = None):
+        super().__init__(topicMap=topicMap, transport=transport, endpoint=endpoint, axes=axes)
         if isinstance(config.typeCfg, LinePlotCfg):
             self.config = config
 
-        self.dataSet = dict()
-        self.lines = list()
+        self.lines = self.artists
         self.initUI()
-        self.zmqBridge.registerSubscriptions(self.config.protocol)
-        self.zmqBridge.workerIO._begin()
-        self.anim = None
         self.setupPlot()
 
     def setupPlot(self):
         # Set initial x-data based on the configured sample buffer length
-        self.xs = list(range(0, self.config.sampleBufferLen))
+        self.xs = np.arange(self.config.sampleBufferLen, dtype=np.float64)
         if isinstance(self.config.typeCfg, LinePlotCfg):
             self.ax.set_ylim(self.config.typeCfg.yrange)
+            self._setXRange()
 
             # Enable minor ticks and set thinner grid lines
             self.ax.minorticks_on()
@@ -113,80 +313,292 @@ class LinePlot(BasePlot):
             self.ax.grid(which='minor', linestyle=':', linewidth=0.3)
 
             for label in self.config.protocol:
-                if label not in self.dataSet:
-                    # Start with an empty data list
-                    self.dataSet[label] = []
-                    line, = self.ax.plot([], [], label=label, linewidth=0.75)
-                    self.lines.append(line)
+                line, = self.ax.plot([], [], label=label, linewidth=0.75, animated=True)
+                self.lines.append(line)
             self.ax.legend(loc=1)
             self.ax.tick_params(axis="both", which="both")
-            self.ax.set_xlabel("Sample")
-            self.anim = self.animation = animation.FuncAnimation(
-                self.fig, self.animate, fargs=(self.lines,),
-                interval=200, blit=False, cache_frame_data=False
-            )
+            self.ax.set_xlabel("Time (s)" if self.config.typeCfg.timeAxis else "Sample")
+        self.startStream()
 
-    def initUI(self):
-        """Initializes the plot UI."""
-        self.fig = plt.figure()
-        self.ax = self.fig.add_subplot(1, 1, 1)
-        self.ax.grid(linestyle='dashed', linewidth=0.5)
-        self.canvas = FigureCanvas(self.fig)
-        layout = QGridLayout()
-        layout.addWidget(self.canvas, 0, 0, 5, 5)
-        self.setLayout(layout)
-        self.setContentsMargins(0, 0, 0, 0)
-      
-    @QtCore.pyqtSlot(tuple)
-    def _updateData(self, msg: tuple[tuple, str]):
-        topic, data = msg
-        try:
-            # Append new data to the list for this topic
-            self.dataSet[topic].append(float(data))
-        except Exception as e:
-            self.log.error(f"Exception in UpdateData: {e}")
-       
-    def animate(self, i, lines):
-        # Update each line with new data while supporting variable-length arrays.
-        for line, (key, value) in zip(lines, self.dataSet.items()):
-            # If there are more points than the buffer, show only the last N points;
-            # otherwise, display all points.
-            display_data = value[-self.config.sampleBufferLen:] if len(value) > self.config.sampleBufferLen else value
-            new_x = list(range(len(display_data)))
-            line.set_data(new_x, display_data)
-        self.ax.relim()
-        self.ax.autoscale_view()
-        return lines
+    def _setXRange(self):
+        if self.config.typeCfg.timeAxis:
+            self.ax.set_xlim(-self.config.typeCfg.timeWindow, 0)
+        else:
+            self.ax.set_xlim(0, max(1, self.config.sampleBufferLen - 1))
+
+    def _window(self, label: str, ts: np.ndarray, ys: np.ndarray, tNow: float) -> tuple[np.ndarray, np.ndarray]:
+        """Visible x, y of a series, O(log n) search then O(visible) work."""
+        if not self.config.typeCfg.timeAxis:
+            return self.xs[:len(ys)], ys
+        scale = self._timeScale(label)
+        tNow = tNow / scale # in this series' timestamp units
+        t0 = tNow - self.config.typeCfg.timeWindow / scale
+        if label in self.dataSet: # plot local, raw only
+            i0 = np.searchsorted(ts, t0)
+            return (ts[i0:] - tNow) * scale, ys[i0:] # seconds before the newest sample of any series
+        tCleared = self._clearedAt(label)
+        if tCleared is not None:
+            t0 = max(t0, np.nextafter(tCleared, np.inf))
+        ts, lo, hi, _ = self.store.overview(label, t0, tNow)
+        if lo is hi: # raw samples reach back to t0
+            return (ts - tNow) * scale, lo
+        # Window longer than the raw history, draw each pyramid bucket's min and max
+        return np.repeat((ts - tNow) * scale, 2), np.column_stack((lo, hi)).ravel()
+
+    def _syncBufferLen(self) -> bool:
+        # sampleBufferLen may be changed on the live config, e.g. by SigGenApp
+        if len(self.xs) == self.config.sampleBufferLen:
+            return False
+        self.xs = np.arange(self.config.sampleBufferLen, dtype=np.float64)
+        for ring in self.dataSet.values():
+            ring.resize(self.config.sampleBufferLen)
+        for label in self.config.protocol:
+            columns = self.store.series.get(label)
+            if columns is not None:
+                columns[0].reserve(self.config.sampleBufferLen)
+        self._setXRange()
+        return True
+
+    def _updateArtists(self) -> bool:
+        # Index mode reads the newest sampleBufferLen points, views and xs slices allocate nothing
+        fullDraw = self._syncBufferLen()
+        n = None if self.config.typeCfg.timeAxis else self.config.sampleBufferLen
+        series = [self._series(line.get_label(), n) for line in self.lines]
+        tNow = max((ts[-1] * self._timeScale(line.get_label()) for line, (ts, _) in zip(self.lines, series) if len(ts)),
+                   default=0.0) # seconds, a shared reference aligns multi rate series
+        visible = list()
+        for line, (ts, ys) in zip(self.lines, series):
+            xs, ys = self._window(line.get_label(), ts, ys, tNow)
+            line.set_data(*decimate(xs, ys, self.pixelWidth, self.config.typeCfg.decimation))
+            visible.append(ys)
+        ylim = expandRange(self.ax.get_ylim(), visible)
+        if ylim is not None:
+            self.ax.set_ylim(ylim)
+        return fullDraw or ylim is not None
     
+    def snapshot(self) -> FigureSnapshot:
+        snapshot = super().snapshot()
+        if self.config.typeCfg.timeAxis:
+            snapshot.window = self.config.typeCfg.timeWindow
+        return snapshot
+
+    def _snapshotArtists(self) -> list[ArtistSnapshot]:
+        artists = list()
+        timeAxis = self.config.typeCfg.timeAxis
+        for line in self.lines:
+            label = line.get_label()
+            ts, ys = self._series(label, None if timeAxis else self.config.sampleBufferLen)
+            style = {"linewidth": line.get_linewidth(), "color": line.get_color()}
+            if timeAxis and label not in self.dataSet: # x is time before the frame, in display seconds
+                artists.append(ArtistSnapshot(label=label, t=ts * self._timeScale(label), y=ys.copy(), style=style))
+            else:
+                artists.append(ArtistSnapshot(label=label, t=ts.copy(), x=self.xs[:len(ys)].copy(), y=ys.copy(), style=style))
+        return artists
+
     def drawLineOnPlot(self, label: str, data: np.ndarray):
         """Directly update the plot with a new complete dataset for the given label."""
-        new_data = data.tolist() if isinstance(data, np.ndarray) else data
-        new_x = list(range(len(new_data)))
-        if label in self.dataSet and any(line.get_label() == label for line in self.lines):
-            self.dataSet[label] = new_data
-            for line in self.lines:
-                if line.get_label() == label:
-                    line.set_data(new_x, new_data)
-                    break
-        else:
-            self.dataSet[label] = new_data
-            line, = self.ax.plot(new_x, new_data, label=label)
+        self._syncBufferLen()
+        ring = self.dataSet.get(label)
+        if ring is None:
+            ring = self.dataSet[label] = RingBuffer(self.config.sampleBufferLen, fields=2)
+        data = np.asarray(data, dtype=np.float64)
+        ring.replace(np.column_stack((np.arange(len(data), dtype=np.float64), data))) # no timestamps, index as time
+        if not any(line.get_label() == label for line in self.lines):
+            line, = self.ax.plot([], [], label=label, animated=True)
             self.lines.append(line)
-            
-        self.ax.relim()
-        self.ax.autoscale_view()
-        self.ax.legend(loc=1)
-        self.canvas.draw_idle() # Update the plot with the new data
+            self.ax.legend(loc=1)
+            self.background = None # legend changed
+        self.dirty = True
 
     def clearData(self, label: str):
-        """Clear the data for the specified label."""
+        """Clear the data for the specified label, store series are only hidden from this plot."""
         if label in self.dataSet:
-            self.dataSet[label] = []
-            for line in self.lines:
-                if line.get_label() == label:
-                    line.set_data([], [])
-                    break
-            self.canvas.draw_idle()
+            self.dataSet[label].clear()
+        elif not np.isnan(self.store.lastTime(label)): # NaN when nothing is stored yet
+            self.clearedAt[label] = self.store.lastTime(label)
+        else:
+            return
+        self.dirty = True
+
+class ScatterPlot(BasePlot):
+    """Point cloud per (x, y) pair of consecutive protocol series, bounded by sampleBufferLen."""
+    def __init__(self, topicMap, config: PlotCfg, transport: Transport, endpoint: Endpoint, axes: Optional[Axes] = None):
+        super().__init__(topicMap=topicMap, transport=transport, endpoint=endpoint, axes=axes)
+        if isinstance(config.typeCfg, ScatterPlotCfg):
+            self.config = config
+        else:
+            self.config = PlotCfg(plotType="SCATTER", typeCfg=ScatterPlotCfg())
+        self.initUI()
+        self.setupPlot()
+
+    def setupPlot(self):
+        cfg = self.config.typeCfg
+        self.ax.set_xlim(cfg.xrange)
+        self.ax.set_ylim(cfg.yrange)
+        protocol = self.config.protocol
+        if len(protocol) % 2:
+            self.log.warning(f"Scatter series {protocol[-1]} has no pair, ignored")
+        self.pairs = list(zip(protocol[0::2], protocol[1::2]))
+        for xLabel, yLabel in self.pairs:
+            points = self.ax.scatter([], [], marker=cfg.marker, s=SCATTER_MARKER_SIZE,
+                                     label=f"{yLabel} vs {xLabel}", animated=True)
+            self.artists.append(points)
+        if self.pairs:
+            self.ax.legend(loc=1)
+        if len(self.pairs) == 1:
+            self.ax.set_xlabel(self.pairs[0][0])
+            self.ax.set_ylabel(self.pairs[0][1])
+        self.startStream()
+
+    def _updateArtists(self) -> bool:
+        xViews, yViews = list(), list()
+        for points, (xLabel, yLabel) in zip(self.artists, self.pairs):
+            _, xs, ys = self._pair(xLabel, yLabel, self.config.sampleBufferLen)
+            points.set_offsets(np.column_stack((xs, ys)))
+            xViews.append(xs)
+            yViews.append(ys)
+        xlim = expandRange(self.ax.get_xlim(), xViews)
+        ylim = expandRange(self.ax.get_ylim(), yViews)
+        if xlim is not None:
+            self.ax.set_xlim(xlim)
+        if ylim is not None:
+            self.ax.set_ylim(ylim)
+        return xlim is not None or ylim is not None
+
+    def _snapshotArtists(self) -> list[ArtistSnapshot]:
+        artists = list()
+        for points, (xLabel, yLabel) in zip(self.artists, self.pairs):
+            ts, xs, ys = self._pair(xLabel, yLabel, self.config.sampleBufferLen)
+            artists.append(ArtistSnapshot(kind="scatter", label=points.get_label(), t=ts.copy(), x=xs.copy(), y=ys.copy(),
+                                          style={"marker": self.config.typeCfg.marker, "s": SCATTER_MARKER_SIZE}))
+        return artists
+
+class BarPlot(BasePlot):
+    """Latest value of every protocol series, one bar each."""
+    def __init__(self, topicMap, config: PlotCfg, transport: Transport, endpoint: Endpoint, axes: Optional[Axes] = None):
+        super().__init__(topicMap=topicMap, transport=transport, endpoint=endpoint, axes=axes)
+        if isinstance(config.typeCfg, BarPlotCfg):
+            self.config = config
+        else:
+            self.config = PlotCfg(plotType="BAR", typeCfg=BarPlotCfg())
+        self.initUI()
+        self.setupPlot()
+
+    def setupPlot(self):
+        cfg = self.config.typeCfg
+        labels = self.config.protocol
+        positions = np.arange(len(labels))
+        self.bars = self.ax.bar(positions, np.zeros(len(labels)), width=cfg.barWidth, animated=True)
+        self.artists.extend(self.bars.patches)
+        self.ax.set_xticks(positions, [label.rsplit("/", 1)[-1] for label in labels], rotation=45, ha="right")
+        self.ax.set_ylim(-cfg.ylim, cfg.ylim)
+        self.ax.axhline(0, linewidth=0.5)
+        self.fig.tight_layout()
+        self.startStream()
+
+    def _updateArtists(self) -> bool:
+        latest = [self._series(label, 1)[1] for label in self.config.protocol]
+        heights = np.nan_to_num(np.array([ys[0] if len(ys) else 0.0 for ys in latest]))
+        for bar, height in zip(self.bars.patches, heights.tolist()):
+            bar.set_height(height)
+        ylim = expandRange(self.ax.get_ylim(), [heights])
+        if ylim is not None:
+            self.ax.set_ylim(ylim)
+        return ylim is not None
+
+    def _snapshotArtists(self) -> list[ArtistSnapshot]:
+        artists = list()
+        for label in self.config.protocol:
+            ts, ys = self._series(label, self.config.sampleBufferLen)
+            artists.append(ArtistSnapshot(kind="bar", label=label, t=ts.copy(), y=ys.copy(),
+                                          style={"width": self.config.typeCfg.barWidth}))
+        return artists
+
+PlotClassMap = {
+            "LINE": LinePlot,
+            "SCATTER": ScatterPlot,
+            "BAR": BarPlot
+        }
+
+class DashboardPlot(QFrame):
+    """
+    Several PlotCfgs as subplots of one figure. One canvas, one scheduler entry and
+    one blit per frame however many members, each member only updates its artists.
+    """
+    def __init__(self, topicMap, config: PlotCfg, members: list[PlotCfg], transport: Transport, endpoint: Endpoint):
+        super().__init__()
+        self.log = getmylogger(__name__)
+        self.config = config
+        self.background = None
+        self.fig = plt.figure()
+        self.canvas = FigureCanvas(self.fig)
+        self.canvas.mpl_connect("draw_event", self._onDraw)
+        layout = QGridLayout()
+        layout.addWidget(self.canvas, 0, 0, 5, 5)
+        self.setLayout(layout)
+        self.setContentsMargins(0, 0, 0, 0)
+
+        members = [member for member in members if member.plotType in PlotClassMap] # no nested dashboards
+        self.columns = max(1, min(config.typeCfg.columns, len(members)))
+        rows = max(1, math.ceil(len(members) / self.columns))
+        self.plots: list[BasePlot] = list()
+        for i, member in enumerate(members):
+            ax = self.fig.add_subplot(rows, self.columns, i + 1)
+            ax.grid(linestyle='dashed', linewidth=0.5)
+            ax.set_title(member.name, fontsize="small")
+            self.plots.append(PlotClassMap[member.plotType](topicMap=topicMap, config=member,
+                                                            transport=transport, endpoint=endpoint, axes=ax))
+        self.fig.tight_layout()
+        self.scheduler = RenderScheduler.instance()
+        self.scheduler.register(self)
+
+    @property
+    def dirty(self) -> bool:
+        return any(plot.dirty for plot in self.plots)
+
+    def _onDraw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        for plot in self.plots:
+            plot.pixelWidth = max(1, int(plot.ax.bbox.width))
+            for artist in plot.artists:
+                plot.ax.draw_artist(artist)
+            plot._markDrawn()
+
+    def hidden(self):
+        for plot in self.plots:
+            plot.hidden()
+
+    def render(self):
+        """Shared pass, members update their artists then the figure is blitted once."""
+        stale = [plot for plot in self.plots if plot.dirty]
+        if not stale:
+            return
+        fullDraw = self.background is None
+        for plot in stale:
+            plot.dirty = False
+            fullDraw = plot._updateArtists() or fullDraw
+        if fullDraw:
+            self.canvas.draw() # draw_event recaches the background
+            return
+        self.canvas.restore_region(self.background)
+        for plot in self.plots:
+            for artist in plot.artists:
+                plot.ax.draw_artist(artist)
+        self.canvas.blit(self.fig.bbox)
+        for plot in stale:
+            plot._markDrawn()
+
+    def snapshot(self) -> FigureSnapshot:
+        rows = max(1, math.ceil(len(self.plots) / self.columns))
+        return FigureSnapshot(title=self.config.name, panels=[plot.snapshot() for plot in self.plots],
+                              columns=self.columns, figsize=(5 * self.columns, 3.5 * rows), theme=PLOT_THEME)
+
+    def close(self):
+        self.log.debug(f"Closing Dashboard {self.config.name}")
+        self.scheduler.unregister(self)
+        for plot in self.plots:
+            plot.close()
+
 """ ----------------- Plot App Settings ----------------- """
 class PlotAppSettings(SettingsUI):
     def __init__(self, config: PlotAppCfg, topicMap: TopicMap):
@@ -279,13 +691,18 @@ class PlotSettings(SettingsUI):
         self.maxSeries.setMaximumWidth(50)
         self.sampleBuffer = QLineEdit(str(self.config.sampleBufferLen))
         self.sampleBuffer.setMaximumWidth(50)
-        self.linePlotSettings = LinePlotSettings(LinePlotCfg())
-        self.scatterPlotSettings = ScatterPlotSettings(ScatterPlotCfg())
-        self.barPlotSettings = BarPlotSettings(BarPlotCfg())        
+        # Each page edits the current typeCfg when it matches, else a fresh default
+        typeCfg = self.config.typeCfg
+        self.linePlotSettings = LinePlotSettings(typeCfg if isinstance(typeCfg, LinePlotCfg) else LinePlotCfg())
+        self.scatterPlotSettings = ScatterPlotSettings(typeCfg if isinstance(typeCfg, ScatterPlotCfg) else ScatterPlotCfg())
+        self.barPlotSettings = BarPlotSettings(typeCfg if isinstance(typeCfg, BarPlotCfg) else BarPlotCfg())
+        self.dashboardSettings = DashboardPlotSettings(typeCfg if isinstance(typeCfg, DashboardPlotCfg) else DashboardPlotCfg())
         self.plotCfgStack = QStackedLayout()
         self.plotCfgStack.addWidget(self.linePlotSettings)
         self.plotCfgStack.addWidget(self.scatterPlotSettings)
         self.plotCfgStack.addWidget(self.barPlotSettings)
+        self.plotCfgStack.addWidget(self.dashboardSettings)
+        self.plotCfgStack.setCurrentIndex(self.plotType.currentIndex())
         self.plotType.currentIndexChanged.connect(self.plotCfgStack.setCurrentIndex)
         self.table = DataSeriesTable()
         self.table.loadSubscriptions(self.config.protocol)
@@ -312,7 +729,7 @@ class PlotSettings(SettingsUI):
         self.config.sampleBufferLen = int(self.sampleBuffer.text())
         self.config.protocol = self.table.grabSubscriptions()
         stackWidget = self.plotCfgStack.currentWidget()
-        if isinstance(stackWidget, LinePlotSettings):
+        if isinstance(stackWidget, (LinePlotSettings, ScatterPlotSettings, BarPlotSettings, DashboardPlotSettings)):
             stackWidget.updateConfig()
             self.config.typeCfg = stackWidget.config
 
@@ -326,15 +743,31 @@ class LinePlotSettings(SettingsUI):
         self.yMax = QLineEdit(str(self.config.yrange[1]))
         self.yMin.setMaximumWidth(50)
         self.yMax.setMaximumWidth(50)
+        self.decimation = QComboBox()
+        self.decimation.addItems(DECIMATION_METHODS)
+        self.decimation.setCurrentText(self.config.decimation)
+        self.timeAxis = QCheckBox("Time Axis")
+        self.timeAxis.setChecked(self.config.timeAxis)
+        self.timeWindow = QLineEdit(str(self.config.timeWindow))
+        self.timeWindow.setMaximumWidth(50)
+        self.timeWindow.setToolTip("Seconds, each series' timestamps are converted by its topic's timeScale in the topic map")
         self.grid = QGridLayout()
         self.grid.addWidget(QLabel("Y Min"), 0, 0)
         self.grid.addWidget(self.yMin, 0, 1)
         self.grid.addWidget(QLabel("Y Max"), 0, 2)
         self.grid.addWidget(self.yMax, 0, 3)
+        self.grid.addWidget(QLabel("Decimation"), 1, 0)
+        self.grid.addWidget(self.decimation, 1, 1, 1, 3)
+        self.grid.addWidget(self.timeAxis, 2, 0, 1, 2)
+        self.grid.addWidget(QLabel("Window (s)"), 2, 2)
+        self.grid.addWidget(self.timeWindow, 2, 3)
         self.setLayout(self.grid)
 
     def updateConfig(self):
         self.config.yrange = (float(self.yMin.text()), float(self.yMax.text()))
+        self.config.decimation = self.decimation.currentText()
+        self.config.timeAxis = self.timeAxis.isChecked()
+        self.config.timeWindow = float(self.timeWindow.text())
 
 class ScatterPlotSettings(SettingsUI):
     def __init__(self, config: ScatterPlotCfg):
@@ -352,6 +785,7 @@ class ScatterPlotSettings(SettingsUI):
         self.xMax.setMaximumWidth(50)
         self.marker = QComboBox()
         self.marker.addItems(["o", "x", "s", "d"])
+        self.marker.setCurrentText(self.config.marker)
         self.grid = QGridLayout()
         self.grid.addWidget(QLabel("Y Min"), 0, 0)
         self.grid.addWidget(self.yMin, 0, 1)
@@ -391,6 +825,27 @@ class BarPlotSettings(SettingsUI):
         self.config.ylim = int(self.ylim.text())
         self.config.barWidth = float(self.barWidth.text())
 
+class DashboardPlotSettings(SettingsUI):
+    def __init__(self, config: DashboardPlotCfg):
+        super().__init__()
+        self.config = config
+        self.initUI()
+    def initUI(self):
+        self.members = QLineEdit(", ".join(self.config.members))
+        self.members.setPlaceholderText("Plot names, comma separated")
+        self.columns = QLineEdit(str(self.config.columns))
+        self.columns.setMaximumWidth(50)
+        self.grid = QGridLayout()
+        self.grid.addWidget(QLabel("Plots"), 0, 0)
+        self.grid.addWidget(self.members, 0, 1, 1, 3)
+        self.grid.addWidget(QLabel("Columns"), 1, 0)
+        self.grid.addWidget(self.columns, 1, 1)
+        self.setLayout(self.grid)
+
+    def updateConfig(self):
+        self.config.members = tuple(name.strip() for name in self.members.text().split(",") if name.strip())
+        self.config.columns = int(self.columns.text())
+
 class PlotAppSettingsDialog(QDialog):
     def __init__(self, config: PlotAppCfg, topicMap: TopicMap):
         super().__init__()
@@ -1,7 +1,8 @@
 import os
-import re
-import csv
 import sys
+import time
+import shutil
+import queue
 import signal
 from functools import partial
 from datetime import datetime
@@ -16,110 +17,143 @@ from client.plot import LinePlot, PlotCfg, LinePlotCfg
 from client.menus import SettingsUI
 from client.controller import ControllerCfg
 from common.messages import TopicMap, Topic
-from common.zmqutils import ZmqPub, Transport, Endpoint, ZmqSub
+from common.zmqutils import ZmqPub, Transport, Endpoint, ZmqSub, DropStats
+from common.telemHub import TelemetryHub, TelemFrame
+from common.recording import RecordingWriter, RecordingManifest, SegmentCompressor, RECORDING_FORMATS, openRecording
 from client.menus import DataSeriesTable, ProgressBar, SettingsUI, FileExplorer, DataSeriesTableSettings
 
 
+RECORDER_POLL_S = 0.1 # max latency for noticing stop()
+RECORDER_HWM = 100000 # frames queued for the writer before new ones are dropped
+RECORDER_ROTATE_BYTES = 5 * 1024 * 1024 # segment size limit
+RECORDER_ROTATE_S = 600 # segment duration limit
+RECORDER_BATCH = 1024 # frames drained from the queue per pass
+RECORDER_FLUSH_S = 0.5 # worst case data lost on a crash, writers also flush when their buffers fill
+RECORDER_PROGRESS_S = 0.25 # progress signal period
+
 class RecorderThread(QThread):
-    progress = pyqtSignal(int)
+    progress = pyqtSignal(int) # frames recorded so far, at most every RECORDER_PROGRESS_S
     error = pyqtSignal(str)
     finished = pyqtSignal()
 
-    def __init__(self, filename, subscriptions, topic_map, transport, endpoint):
+    def __init__(self, filename, subscriptions, topic_map, transport, endpoint, fmt: str = "csv"):
         super().__init__()
         self.filename = filename
+        self.fmt = fmt
         self.subscriptions = subscriptions
         self.topic_map = topic_map
         self.transport = transport
         self.endpoint = endpoint
         self._stopped = False
-        self.sub = None
+        self.log = getmylogger(__name__)
+        self.hub = TelemetryHub.instance()
+        self.frames = queue.Queue(maxsize=RECORDER_HWM) # TelemFrames pushed by the hub I/O thread
+        self.stats = DropStats()
+        self.rows = 0
+        self.manifest = None
+
+    def _onFrame(self, frame: TelemFrame):
+        # Runs on the hub I/O thread, must never block it
+        self.stats.received += 1
+        try:
+            self.frames.put_nowait(frame)
+        except queue.Full:
+            self.stats.dropped += 1
 
     def run(self):
+        writer = None
         try:
-            self.sub = ZmqSub(transport=self.transport, endpoint=self.endpoint)
             for topicname in self.subscriptions:
-                self.sub.addTopicSub(topicname)
-                print(f"Subscribed to {topicname}")
-            self.sub.connect()
+                topic = self.topic_map.get_topic_by_name(topicname)
+                if isinstance(topic, Topic):
+                    self.hub.register(topic, self._onFrame, self.transport, self.endpoint)
+                    self.log.info(f"Subscribed to {topicname}")
 
             os.makedirs(os.path.dirname(self.filename), exist_ok=True)
-            current_file = None
-            writer = None
-
+            self.manifest = RecordingManifest.open(self.filename)
 
+            lastFlush = lastProgress = time.monotonic()
             while not self._stopped:
-                if current_file is None or current_file.closed:
-                    current_file, writer, headers = self.initialize_file()
-                
-                try:
-                    topic_name, msg, timestamp = self.sub.receive()
-                except TimeoutError:
-                    continue
-
-                topic = self.topic_map.get_topic_by_name(topic_name)
-                if not isinstance(topic, Topic):
-                    continue
-                
-                if(topic.nArgs > 2): # HACK makes data-points shallow vs deep
-                        msgArgsVal = msg.split(topic.delim)
-                        msgSubTopics  = [f"{topic}/{argname}" for argname in topic.args[:-1]]# HACK omit timestamp from arg names
-                        if len(msgArgsVal) == len(msgSubTopics) :  # check all data is present
-                            row = [timestamp] + msgArgsVal
-                            if writer is not None:
-                                writer.writerow(row)
-                                self.progress.emit(1)
-                else:
-                    row = [timestamp] + [msg]
-                    if writer is not None:
-                        writer.writerow(row)
-                    self.progress.emit(1)
+                if writer is None:
+                    writer = self.initialize_file()
+                    opened = time.monotonic()
 
-                if current_file.tell() > 5 * 1024 * 1024:  # 5MB
-                    current_file.close()
-                    self.rotate_file()
-                    current_file, writer, headers = self.initialize_file()
+                batch = list()
+                try:
+                    batch.append(self.frames.get(timeout=RECORDER_POLL_S))
+                    while len(batch) < RECORDER_BATCH:
+                        batch.append(self.frames.get_nowait())
+                except queue.Empty:
+                    pass
+
+                self.write_batch(writer, batch)
+
+                now = time.monotonic()
+                if now - lastFlush >= RECORDER_FLUSH_S:
+                    writer.flush()
+                    lastFlush = now
+                if now - lastProgress >= RECORDER_PROGRESS_S:
+                    self.progress.emit(self.rows)
+                    lastProgress = now
+
+                if writer.size() > RECORDER_ROTATE_BYTES or now - opened > RECORDER_ROTATE_S:
+                    self.rotate_file(writer)
+                    writer = None
 
         except Exception as e:
             self.error.emit(f"Recording error: {str(e)}")
         finally:
-            if current_file and not current_file.closed:
-                current_file.close()
+            self.hub.unregister(self._onFrame, self.transport, self.endpoint)
+            try:
+                writer = self.drain(writer)
+            except Exception as e:
+                self.error.emit(f"Recording error: {str(e)}")
+            if self.stats.dropped:
+                self.log.warning(f"Recorder dropped {self.stats.dropped} of {self.stats.received} frames")
+            if writer is not None:
+                self.rotate_file(writer)
             self.finished.emit()
 
-    def initialize_file(self):
+    def write_batch(self, writer: RecordingWriter, batch: list[TelemFrame]):
+        for frame in batch:
+            if frame.topic.name in writer.topics:
+                writer.write(frame)
+                self.rows += 1
+
+    def drain(self, writer: RecordingWriter | None) -> RecordingWriter | None:
+        """Write the frames still queued once the hub sink is gone, the last segment keeps them."""
+        batch = list()
+        while True:
+            try:
+                batch.append(self.frames.get_nowait())
+            except queue.Empty:
+                break
+        if batch and writer is None and self.manifest is not None:
+            writer = self.initialize_file()
+        if writer is not None:
+            self.write_batch(writer, batch)
+        return writer
+
+    def initialize_file(self) -> RecordingWriter:
         try:
-            file = open(self.filename, 'w', newline='')
-            writer = csv.writer(file)
-            headers = ['timestamp'] 
-            for topic_name in self.subscriptions:
-                topic = self.topic_map.get_topic_by_name(topic_name)
-                if not isinstance(topic, Topic):
-                    continue
-                for arg in topic.args[:-1]: # HACK omit timestamp from arg names
-                    headers.append(f"{topic_name}/{arg}")
-                    
-            writer.writerow(headers)
-            return file, writer, headers
+            topics = [self.topic_map.get_topic_by_name(name) for name in self.subscriptions]
+            return openRecording(self.fmt, self.filename, [topic for topic in topics if isinstance(topic, Topic)])
         except IOError as e:
             self.error.emit(f"Failed to open file: {str(e)}")
             raise
 
-    def rotate_file(self):
+    def rotate_file(self, writer: RecordingWriter):
+        """Close the active segment and list it in the manifest, it stays raw until archived."""
         try:
-            base, ext = os.path.splitext(self.filename)
-            dir_name = os.path.dirname(self.filename)
-            max_index = 0
-            pattern = re.compile(rf'^{re.escape(base)}_(\d+){re.escape(ext)}$')
-            
-            for filename in os.listdir(dir_name):
-                match = pattern.match(filename)
-                if match:
-                    index = int(match.group(1))
-                    max_index = max(max_index, index)
-            
-            new_filename = f"{base}_{max_index + 1}{ext}"
-            os.rename(self.filename, new_filename)
+            writer.close()
+            if writer.rows == 0: # nothing recorded, no segment
+                if os.path.isdir(writer.path):
+                    shutil.rmtree(writer.path)
+                else:
+                    os.remove(writer.path)
+                return
+            segment = self.manifest.add(writer, self.fmt)
+            self.log.info(f"Closed segment {segment['path']} {segment['rows']} rows")
         except Exception as e:
             self.error.emit(f"File rotation failed: {str(e)}")
 
@@ -151,6 +185,8 @@ class RecorderApp(QWidget):
         self.dataSeriesTable.setMaximumSize(300, 100)
         self.topicCombo = QComboBox()
         self.topicCombo.addItems(self.topicMap.get_topic_names())
+        self.formatCombo = QComboBox()
+        self.formatCombo.addItems(RECORDING_FORMATS)
         self.add_PB = QPushButton("Add")
         self.add_PB.clicked.connect(self.add_series_handle)
         self.remove_PB = QPushButton("Remove")
@@ -169,7 +205,10 @@ class RecorderApp(QWidget):
         self.stop_PB = QPushButton("Stop")
         self.stop_PB.clicked.connect(self.stop_handle)
         self.stop_PB.setEnabled(False)
+        self.archive_PB = QPushButton("Archive") # compress the recording's closed csv segments
+        self.archive_PB.clicked.connect(self.archive_handle)
         self.progressBar = ProgressBar()
+        self.rowsLbl = QLabel("Rows: 0")
 
         self.vbox.addWidget(self.topicCombo, alignment=Qt.AlignmentFlag.AlignTop)
         self.vbox.addWidget(self.dataSeriesTable, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -177,9 +216,12 @@ class RecorderApp(QWidget):
 
         self.vbox.addWidget(self.fileLbl, alignment=Qt.AlignmentFlag.AlignCenter)
         self.vbox.addWidget(self.file_PB)
+        self.vbox.addWidget(self.formatCombo)
         self.vbox.addWidget(self.record_PB)
         self.vbox.addWidget(self.progressBar)
+        self.vbox.addWidget(self.rowsLbl, alignment=Qt.AlignmentFlag.AlignCenter)
         self.vbox.addWidget(self.stop_PB)
+        self.vbox.addWidget(self.archive_PB)
         self.setLayout(self.vbox)
 
     def file_selected_handle(self, file):
@@ -215,9 +257,10 @@ class RecorderApp(QWidget):
             subscriptions=subscriptions,
             topic_map=self.topicMap,
             transport=self.transport,
-            endpoint=self.endpoint
+            endpoint=self.endpoint,
+            fmt=self.formatCombo.currentText()
         )
-        self.recording_thread.progress.connect(self.progressBar.update)
+        self.recording_thread.progress.connect(self.progress_handle)
         self.recording_thread.error.connect(self.handle_error)
         self.recording_thread.finished.connect(self.on_recording_finished)
         self.recording_thread.start()
@@ -234,6 +277,13 @@ class RecorderApp(QWidget):
         self.stop_PB.setEnabled(False)
         self.progressBar.reset()
 
+    def archive_handle(self):
+        queued = SegmentCompressor.instance().archive(RecordingManifest.open(self.filename))
+        self.log.info(f"Archiving {queued} segments of {self.filename}")
+
+    def progress_handle(self, rows: int):
+        self.rowsLbl.setText(f"Rows: {rows}")
+
     def handle_error(self, message):
         self.log.error(message)
         self.stop_handle()
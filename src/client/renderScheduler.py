@@ -0,0 +1,77 @@
+from PyQt6.QtCore import QObject, QTimer
+
+import time
+import threading
+
+from common.logger import getmylogger
+
+"""
+RenderScheduler: One GUI thread timer for every plot.
+        Each tick renders the dirty plots that are actually on screen, a plot in a
+        background tab or a minimized window keeps buffering and is drawn once shown.
+        Rendering stops for the tick when the frame budget is spent, the next tick
+        resumes with the plots that were skipped so no plot starves.
+"""
+
+RENDER_TARGET_FPS = 25
+RENDER_BUDGET_FRACTION = 0.5 # share of the frame period spent drawing, the rest is left to Qt and ingest
+
+class RenderScheduler(QObject):
+    """Process wide render loop, use RenderScheduler.instance() from the GUI thread."""
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self, targetFps: int = RENDER_TARGET_FPS):
+        super().__init__()
+        self.log = getmylogger(__name__)
+        self.plots = list() # anything with dirty, render(), hidden() and isVisible()
+        self.next = 0 # round robin start, first plot not reached by an over budget tick
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+        self.setTargetFps(targetFps)
+
+    @classmethod
+    def instance(cls) -> "RenderScheduler":
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def setTargetFps(self, fps: int):
+        self.targetFps = max(1, int(fps))
+        self.budget = RENDER_BUDGET_FRACTION / self.targetFps
+        self.timer.setInterval(int(1000 / self.targetFps))
+
+    def register(self, plot):
+        if plot not in self.plots:
+            self.plots.append(plot)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def unregister(self, plot):
+        if plot in self.plots:
+            self.plots.remove(plot)
+        self.next = 0
+        if not self.plots:
+            self.timer.stop()
+
+    @staticmethod
+    def isShown(plot) -> bool:
+        # False for hidden QTabWidget pages and for minimized top level windows
+        return plot.isVisible() and not plot.window().isMinimized()
+
+    def tick(self):
+        start = time.perf_counter()
+        n = len(self.plots)
+        for k in range(n):
+            i = (self.next + k) % n
+            plot = self.plots[i]
+            if not plot.dirty:
+                continue
+            if not self.isShown(plot):
+                plot.hidden()
+                continue
+            plot.render()
+            if time.perf_counter() - start > self.budget:
+                self.next = (i + 1) % n
+                return
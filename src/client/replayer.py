@@ -0,0 +1,175 @@
+import sys
+import signal
+from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QFormLayout, QHBoxLayout, QPushButton, QLabel, QComboBox, QDoubleSpinBox, QCheckBox
+from PyQt6.QtCore import QThread, pyqtSignal, Qt
+from common.logger import getmylogger
+from common.zmqutils import ZmqPub, Transport, Endpoint
+from common.messages import TopicMap
+from common.replay import Replay, REPLAY_HWM, REPLAY_WARMUP_S
+from client.menus import FileExplorer
+
+REPLAY_MODES = ("Original", "Faster", "As fast as possible")
+
+class ReplayThread(QThread):
+    progress = pyqtSignal(int, float) # messages sent, recording seconds replayed
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, path: str, transport: Transport, endpoint: Endpoint, speed: float, restamp: bool,
+                 topicMap: TopicMap):
+        super().__init__()
+        self.log = getmylogger(__name__)
+        self.path = path
+        self.transport = transport
+        self.endpoint = endpoint
+        self.replay = Replay(path, None, speed=speed, topicMap=topicMap, restamp=restamp) # publisher is bound in run()
+
+    def run(self):
+        pub = None
+        try:
+            pub = ZmqPub(self.transport, self.endpoint, hwm=REPLAY_HWM) # owned by this thread
+            pub.bind()
+            self.replay.pub = pub
+            if not self.replay.stop.wait(REPLAY_WARMUP_S):
+                self.replay.run(self.progress.emit)
+        except Exception as e:
+            self.error.emit(f"Replay error: {str(e)}")
+        finally:
+            if pub is not None:
+                pub.close()
+            self.finished.emit()
+
+    def stop(self):
+        self.replay.stop.set()
+
+
+class ReplayApp(QWidget):
+    def __init__(self, endpoint: Endpoint, transport: Transport):
+        super().__init__()
+        self.setWindowTitle("ReplayApp")
+        self.log = getmylogger(__name__)
+        self.endpoint = endpoint
+        self.transport = transport
+        self.replay_thread = None
+        self.topicMap = TopicMap() # each topic's timeScale paces the original timing
+        self.topicMap.load_topics_from_json("robotConfig.json")
+        self.filename = ""
+        self.initUI()
+
+    def initUI(self):
+        self.vbox = QVBoxLayout()
+        self.fileMenu = FileExplorer("Recording")
+        self.fileMenu.fileEntry.textChanged.connect(self.file_selected_handle)
+
+        self.modeCombo = QComboBox()
+        self.modeCombo.addItems(REPLAY_MODES)
+        self.modeCombo.currentTextChanged.connect(self.mode_handle)
+        self.speedSpin = QDoubleSpinBox()
+        self.speedSpin.setRange(1.0, 1000.0)
+        self.speedSpin.setValue(10.0)
+        self.speedSpin.setSuffix("x")
+        self.speedSpin.setEnabled(False)
+        self.restampCheck = QCheckBox()
+        self.transportCombo = QComboBox()
+        self.transportCombo.addItems([t.name for t in Transport])
+        self.transportCombo.setCurrentText(self.transport.name)
+        self.transportCombo.currentTextChanged.connect(self.address_handle)
+        self.endpointCombo = QComboBox() # in app sinks also listen on LOCAL_MSG, see HUB_REPLAY_ENDPOINT
+        self.endpointCombo.addItems([e.name for e in Endpoint])
+        self.endpointCombo.setCurrentText(self.endpoint.name)
+        self.endpointCombo.currentTextChanged.connect(self.address_handle)
+        form = QFormLayout()
+        form.addRow("Transport", self.transportCombo)
+        form.addRow("Endpoint", self.endpointCombo)
+        form.addRow("Mode", self.modeCombo)
+        form.addRow("Speed", self.speedSpin)
+        form.addRow("Restamp", self.restampCheck)
+
+        self.play_PB = QPushButton("Play")
+        self.play_PB.clicked.connect(self.play_handle)
+        self.stop_PB = QPushButton("Stop")
+        self.stop_PB.clicked.connect(self.stop_handle)
+        self.stop_PB.setEnabled(False)
+        hbox = QHBoxLayout()
+        hbox.addWidget(self.play_PB)
+        hbox.addWidget(self.stop_PB)
+        self.statusLbl = QLabel(f"Publishing on {self.transport.value}{self.endpoint.value}")
+
+        self.vbox.addWidget(self.fileMenu)
+        self.vbox.addLayout(form)
+        self.vbox.addLayout(hbox)
+        self.vbox.addWidget(self.statusLbl, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.setLayout(self.vbox)
+
+    def file_selected_handle(self, file):
+        self.filename = file
+
+    def address_handle(self, _):
+        self.transport = Transport[self.transportCombo.currentText()]
+        self.endpoint = Endpoint[self.endpointCombo.currentText()]
+        self.statusLbl.setText(f"Publishing on {self.transport.value}{self.endpoint.value}")
+
+    def mode_handle(self, mode):
+        self.speedSpin.setEnabled(mode == "Faster")
+
+    def speed(self) -> float:
+        mode = self.modeCombo.currentText()
+        if mode == "Original":
+            return 1.0
+        if mode == "Faster":
+            return self.speedSpin.value()
+        return 0.0
+
+    def play_handle(self):
+        if self.replay_thread and self.replay_thread.isRunning():
+            self.log.warning("Replay already running")
+            return
+        if not self.filename:
+            self.log.error("No recording selected")
+            return
+        self.replay_thread = ReplayThread(self.filename, self.transport, self.endpoint,
+                                          self.speed(), self.restampCheck.isChecked(), self.topicMap)
+        self.replay_thread.progress.connect(self.progress_handle)
+        self.replay_thread.error.connect(self.handle_error)
+        self.replay_thread.finished.connect(self.on_replay_finished)
+        self.replay_thread.start()
+        self.play_PB.setEnabled(False)
+        self.stop_PB.setEnabled(True)
+        self.transportCombo.setEnabled(False)
+        self.endpointCombo.setEnabled(False)
+
+    def stop_handle(self):
+        if self.replay_thread:
+            self.replay_thread.stop()
+            self.replay_thread.wait()
+        self.play_PB.setEnabled(True)
+        self.stop_PB.setEnabled(False)
+
+    def progress_handle(self, sent: int, seconds: float):
+        self.statusLbl.setText(f"Sent {sent} messages, {seconds:.1f}s")
+
+    def handle_error(self, message):
+        self.log.error(message)
+        self.statusLbl.setText(message)
+
+    def on_replay_finished(self):
+        self.play_PB.setEnabled(True)
+        self.stop_PB.setEnabled(False)
+        self.transportCombo.setEnabled(True)
+        self.endpointCombo.setEnabled(True)
+
+    def closeEvent(self, event):
+        self.stop_handle()
+        event.accept()
+
+
+def main():
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    app = QApplication(sys.argv)
+    guiApp = ReplayApp(endpoint=Endpoint.LOCAL_MSG, transport=Transport.TCP)
+    guiApp.show()
+    sys.exit(app.exec())
+
+
+if __name__ == '__main__':
+    main()
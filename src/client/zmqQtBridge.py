@@ -1,61 +1,104 @@
 from PyQt6.QtCore import *
 from PyQt6.QtWidgets import *
 
-
+import time
+import threading
+import numpy as np
+from dataclasses import replace
 
 from common.logger import getmylogger
-from common.worker import Worker
-from common.zmqutils import ZmqPub, ZmqSub,Endpoint,Transport
-from common.messages import ParameterMap, TopicMap, Topic
+from common.zmqutils import Endpoint, Transport
+from common.messages import TopicMap, Topic
+from common.telemHub import TelemetryHub, TelemFrame, DecodePlan, SINK_HWM
+from common.zmqutils import DropStats
+from common.latency import LatencyMonitor, LATENCY_ENABLED
+
+BATCH_PERIOD_MS = 20 # time slice drained into one blockSig in batched mode
 
 class ZmqBridgeQt(QObject):
+    """
+    Qt sink on the shared TelemetryHub, re-emits subscribed data series as signals.
+    batchPeriodMs == 0: one msgSig (series, value) per field per message.
+    batchPeriodMs > 0 : one blockSig per time slice carrying a TelemBlock per topic.
+    In batched mode at most hwm samples per topic wait for the GUI thread, older ones
+    are dropped, conflate keeps only the newest. A slow GUI never backs up the hub.
+    """
     msgSig = pyqtSignal(tuple)
-    def __init__(self, topicMap: TopicMap, transport: Transport, endpoint: Endpoint):
+    blockSig = pyqtSignal(tuple)
+    def __init__(self, topicMap: TopicMap, transport: Transport, endpoint: Endpoint, batchPeriodMs: int = 0,
+                 hwm: int = SINK_HWM, conflate: bool = False):
         super().__init__()
         self.log = getmylogger(__name__)
         self.topicMap = topicMap
-        self.workerIO = Worker(self._run)
-        self.subscriptions = None
-        self.subscriber = ZmqSub(transport=transport, endpoint=endpoint)
-      
-    def _run(self):
-       
-        if(self.subscriptions == None):
-            self.log.error("No subscriptions")
-            self.log.info("Exiting ZmqBridge I/O Thread")
-            return
-        
-        self.subscriber.connect()
-        while not self.workerIO.stopEvent.is_set():
-            try:
-                topicname, msg, _ = self.subscriber.receive()
-                topic = self.topicMap.get_topic_by_name(topicname)
-                if(isinstance(topic, Topic)):
-                    if(topic.nArgs > 2): # HACK makes data-points shallow vs deep
-                        msgArgsVal = msg.split(topic.delim)
-                        msgSubTopics  = [f"{topicname}/{argname}" for argname in topic.args[:-1]]# HACK ommit timestamp from arg names
-                        if len(msgArgsVal) == len(msgSubTopics) :  # check all data is present
-                            for i, topicstr in enumerate(msgSubTopics):
-                                if(topicstr in self.subscriptions):
-                                    self.msgSig.emit((topicstr, msgArgsVal[i]))                                
-                    else:
-                        self.msgSig.emit((topicname, msg)) 
-            except Exception as e:
-                self.log.error(f"Exception in ZmqBridgeQt {e}")
-                break
-        
-        self.subscriber.close()
-        self.log.info("Exiting ZmqBridge I/O Thread")
+        self.transport = transport
+        self.endpoint = endpoint
+        self.hub = TelemetryHub.instance()
+        self.latency = LatencyMonitor.instance()
+        self.subscriptions = tuple()
+        self.topics: dict[str, Topic] = dict() # hub topics backing the subscriptions
+        self.plans: dict[str, DecodePlan] = dict() # compiled on registerSubscriptions
+        self.batchPeriodMs = batchPeriodMs
+        self.hwm = hwm
+        self.conflate = conflate
+        self.planLock = threading.Lock() # plans are filled on the I/O thread, drained on the GUI thread
+        self.flushTimer = QTimer(self)
+        self.flushTimer.timeout.connect(self._flush)
+
+    def _onFrame(self, frame: TelemFrame):
+        # Runs on the hub I/O thread, msgSig is queued across to the GUI thread
+        plan = self.plans[frame.topic.name]
+        for topicstr, value in zip(plan.names, plan.gather(frame.values)):
+            self.msgSig.emit((topicstr, value))
+
+    def _onFrameBatched(self, frame: TelemFrame):
+        # Runs on the hub I/O thread, indexed gather straight into the plan's preallocated slots
+        plan = self.plans[frame.topic.name]
+        with self.planLock:
+            ok = plan.append(frame)
+        if not ok:
+            self.log.error(f"Dropped malformed sample on {frame.topic.name}")
+
+    def _flush(self):
+        with self.planLock:
+            blocks = tuple(block for block in (plan.drain() for plan in self.plans.values()) if block is not None)
+        if blocks:
+            if LATENCY_ENABLED:
+                self.latency.record("delivery", time.perf_counter() - np.concatenate([b.decodeTimes for b in blocks]))
+            self.blockSig.emit(blocks)
 
     def registerSubscriptions(self, subscriptions: tuple[str, ...]):
-        # WTAH have i gotten myself into????? Theres no API I AM the API, no MORE JSON PLS PLS PLS 
         self.subscriptions = subscriptions
-        for topicname in subscriptions:
-            if("TELEM/TWSB" in topicname):  # HACK
-                topicname = "TELEM/TWSB"
-            topic = self.topicMap.get_topic_by_name(topicname)
-            if(isinstance(topic, Topic)):  
-                self.subscriber.addTopicSub(topicname)
+        for series in subscriptions:
+            topic = self.topicMap.get_topic_by_series(series)
+            if(isinstance(topic, Topic)):
+                self.topics[topic.name] = topic
             else:
-                self.log.error(f"Unknown topic {topicname}")
+                self.log.error(f"Unknown topic {series}")
+        plans = {name: DecodePlan(topic, subscriptions, capacity=self.hwm, conflate=self.conflate)
+                 for name, topic in self.topics.items()}
+        for name in [name for name, plan in plans.items() if not plan.names]:
+            self.log.error(f"No subscribed field of {name} in {subscriptions}")
+            del plans[name]
+            del self.topics[name]
+        with self.planLock:
+            self.plans = plans
+
+    def stats(self) -> dict[str, DropStats]:
+        """Per topic received / dropped / conflated counters."""
+        with self.planLock:
+            return {name: replace(plan.stats) for name, plan in self.plans.items()}
+
+    def start(self):
+        if(len(self.topics) == 0):
+            self.log.error("No subscriptions")
+            return
+        sink = self._onFrameBatched if self.batchPeriodMs > 0 else self._onFrame
+        for topic in self.topics.values():
+            self.hub.register(topic, sink, self.transport, self.endpoint)
+        if self.batchPeriodMs > 0:
+            self.flushTimer.start(self.batchPeriodMs)
 
+    def stop(self):
+        self.flushTimer.stop()
+        self.hub.unregister(self._onFrame, self.transport, self.endpoint)
+        self.hub.unregister(self._onFrameBatched, self.transport, self.endpoint)
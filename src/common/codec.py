@@ -0,0 +1,71 @@
+import re
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+from functools import lru_cache
+from typing import Optional, Sequence, Union
+
+from common.messages import Topic
+
+"""
+Codec: Telemetry payload encodings.
+        ASCII  -- fields joined by topic.delim, e.g. b"0.120:-3.400:..."
+        PACKED -- PACKED_MAGIC + one little endian record laid out by topic.format
+                  (printf style, %f -> float32, %d -> int32, %lf / %ld -> 64 bit).
+        The timestamp is never part of the payload, it travels in its own frame.
+        Decoders accept bytes or a memoryview onto a zero copy zmq.Frame, packed
+        payloads are read in place by np.frombuffer.
+"""
+
+Payload = Union[bytes, memoryview]
+
+PACKED_MAGIC = b"\x00" # NUL never starts an ASCII payload
+_FORMAT_SPEC = re.compile(r"%[-+ #0]*\d*(?:\.\d+)?(l?[dfiu]|s)")
+_FORMAT_DTYPES = {"f": "<f4", "lf": "<f8", "d": "<i4", "i": "<i4", "u": "<u4", "ld": "<i8", "li": "<i8", "lu": "<u8"}
+
+@lru_cache(maxsize=None)
+def packedDtype(fmt: str, nFields: int) -> Optional[np.dtype]:
+    """Record dtype of the first nFields conversions in fmt, None if the topic is not packable."""
+    codes = _FORMAT_SPEC.findall(fmt)[:nFields]
+    if nFields == 0 or len(codes) != nFields or "s" in codes:
+        return None
+    dtypes = [np.dtype(_FORMAT_DTYPES[code]) for code in codes]
+    if all(dtype == dtypes[0] for dtype in dtypes):
+        return np.dtype((dtypes[0], (nFields,))) # homogeneous, decodes as a plain vector
+    return np.dtype([(f"f{i}", dtype) for i, dtype in enumerate(dtypes)])
+
+def topicDtype(topic: Topic) -> Optional[np.dtype]:
+    return packedDtype(topic.format, topic.nArgs - 1) # HACK last arg is the timestamp
+
+def isPacked(payload: Payload) -> bool:
+    return payload[:1] == PACKED_MAGIC
+
+def encodePacked(topic: Topic, values: Sequence[float]) -> bytes:
+    dtype = topicDtype(topic)
+    if dtype is None:
+        raise ValueError(f"Topic {topic.name} has no packable format: {topic.format}")
+    if dtype.names is None:
+        record = np.asarray(values, dtype=dtype.base)
+    else:
+        record = np.array(tuple(values), dtype=dtype)
+    return PACKED_MAGIC + record.tobytes()
+
+def decodePacked(topic: Topic, payload: Payload) -> np.ndarray:
+    """Decode a packed payload into a float64 vector, one element per data field."""
+    dtype = topicDtype(topic)
+    if dtype is None:
+        raise ValueError(f"Topic {topic.name} has no packable format: {topic.format}")
+    if len(payload) - len(PACKED_MAGIC) != dtype.itemsize:
+        raise ValueError(f"Packed payload size {len(payload)} does not match {topic.name}")
+    record = np.frombuffer(payload, dtype=dtype, count=1, offset=len(PACKED_MAGIC))
+    if dtype.names is None:
+        return record[0].astype(np.float64)
+    return structured_to_unstructured(record, dtype=np.float64)[0]
+
+def encodeAscii(topic: Topic, values: Sequence) -> bytes:
+    return topic.delim.join(str(value) for value in values).encode()
+
+def decodeAscii(topic: Topic, payload: Payload) -> list[str]:
+    return str(payload, "utf-8").split(topic.delim)
+
+def decodeText(payload: Payload) -> str:
+    return str(payload, "utf-8")
@@ -14,6 +14,9 @@ class SinkCfg():
 @dataclass
 class LinePlotCfg():
     yrange: tuple[float, float] = (-100, 100)
+    decimation: str = "minmax" # none, minmax or lttb, see common.decimate
+    timeAxis: bool = False # x from the timestamp frame instead of the sample index
+    timeWindow: float = 10.0 # seconds shown in time axis mode, timestamps are scaled by Topic.timeScale
 
 @dataclass
 class ScatterPlotCfg():
@@ -26,21 +29,28 @@ class BarPlotCfg():
     ylim: int = 100
     barWidth: float = 0.35
 
+@dataclass
+class DashboardPlotCfg():
+    members: tuple[str, ...] = field(default_factory=tuple) # names of the PlotCfgs drawn as subplots
+    columns: int = 2
+
 PlotTypeMap = {
             "LINE": LinePlotCfg,
             "SCATTER": ScatterPlotCfg,
-            "BAR": BarPlotCfg
+            "BAR": BarPlotCfg,
+            "DASHBOARD": DashboardPlotCfg
         }
 @dataclass
 class PlotCfg(SinkCfg):
     plotType: str = "LINE"
-    typeCfg: Union[LinePlotCfg, ScatterPlotCfg, BarPlotCfg] = field(default_factory=LinePlotCfg)
+    typeCfg: Union[LinePlotCfg, ScatterPlotCfg, BarPlotCfg, DashboardPlotCfg] = field(default_factory=LinePlotCfg)
     maxPlotSeries: int = 8
 
 @dataclass
 class PlotAppCfg():
     plotConfigs : List[PlotCfg] = field(default_factory=lambda: [PlotCfg()]) # Default Plot Config
     maxPlots: int = 4
+    targetFps: int = 25 # shared by every plot, see RenderScheduler
 
     def load(self, cfgFile: str):
         with open(cfgFile, 'r') as f:
@@ -52,14 +62,20 @@ class PlotAppCfg():
         for cfg in cfg_data["plotConfigs"]:
             if(cfg.get("plotName") in [cfg.name for cfg in self.plotConfigs]):
                 continue # Skip duplicate plot names if any
+            cfg["typeCfg"].pop("timeScale", None) # older sessions, the topic map sets each topic's scale
             cfg["typeCfg"] = PlotTypeMap[cfg["plotType"]](**cfg["typeCfg"])
+            cfg.pop("hwm", None) # older sessions, plots read every sample from the TelemetryStore
+            cfg.pop("conflate", None)
             self.plotConfigs.append(PlotCfg(**cfg)) # unpack dict to PlotCfg
         self.maxPlots = cfg_data["maxPlots"]
+        self.targetFps = cfg_data.get("targetFps", self.targetFps)
 
 """ ----------------- Console App Config ----------------- """
 @dataclass
 class ConsoleCfg(SinkCfg):
     name: str = "Console 0"
+    hwm: int = 1000 # samples per topic held for the GUI before the oldest are dropped
+    conflate: bool = False # only keep the newest sample per topic
 
 @dataclass
 class ConsoleAppCfg():
@@ -0,0 +1,56 @@
+import numpy as np
+
+"""
+Decimate: Display reduction of long series to roughly the pixel width of a plot.
+        minmax -- per pixel column keep the min and the max sample, in time order.
+                  Exact envelope, spikes survive, fully vectorized.
+        lttb   -- Largest Triangle Three Buckets, one point per bucket chosen to
+                  keep the visual shape. Loops over buckets, vectorized inside.
+        Series shorter than the target are returned untouched (no copy).
+"""
+
+DECIMATION_METHODS = ("none", "minmax", "lttb")
+
+def minMaxDecimate(x: np.ndarray, y: np.ndarray, nBins: int) -> tuple[np.ndarray, np.ndarray]:
+    n = len(y)
+    if nBins <= 0 or n <= 2 * nBins:
+        return x, y
+    binSize = -(-n // nBins) # ceil, the last bin may be short
+    nFull = n // binSize
+    body = y[:nFull * binSize].reshape(nFull, binSize)
+    offsets = np.arange(nFull) * binSize
+    iMin = body.argmin(axis=1) + offsets
+    iMax = body.argmax(axis=1) + offsets
+    idx = np.sort(np.stack((iMin, iMax), axis=1), axis=1).ravel() # keep time order within a bin
+    if nFull * binSize < n: # short tail bin
+        tail = y[nFull * binSize:]
+        tailIdx = np.sort([tail.argmin(), tail.argmax()]) + nFull * binSize
+        idx = np.concatenate((idx, tailIdx))
+    return x[idx], y[idx]
+
+def lttbDecimate(x: np.ndarray, y: np.ndarray, nOut: int) -> tuple[np.ndarray, np.ndarray]:
+    n = len(y)
+    if nOut < 3 or n <= nOut:
+        return x, y
+    edges = np.linspace(1, n - 1, nOut - 1).astype(np.intp) # nOut - 2 buckets between the fixed ends
+    counts = np.diff(np.append(edges, n)).astype(np.float64)
+    meanX = np.add.reduceat(x, edges) / counts # bucket centroids, the last "bucket" is the end point
+    meanY = np.add.reduceat(y, edges) / counts
+    idx = np.empty(nOut, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+    prev = 0
+    for b in range(nOut - 2):
+        lo, hi = edges[b], edges[b + 1]
+        px, py = x[prev], y[prev]
+        # twice the triangle area against the next bucket's centroid, constant factors dropped
+        area = np.abs((px - meanX[b + 1]) * (y[lo:hi] - py) - (px - x[lo:hi]) * (meanY[b + 1] - py))
+        prev = lo + int(area.argmax())
+        idx[b + 1] = prev
+    return x[idx], y[idx]
+
+def decimate(x: np.ndarray, y: np.ndarray, pixels: int, method: str = "minmax") -> tuple[np.ndarray, np.ndarray]:
+    if method == "minmax":
+        return minMaxDecimate(x, y, pixels)
+    if method == "lttb":
+        return lttbDecimate(x, y, 2 * pixels) # same point budget as minmax
+    return x, y
@@ -0,0 +1,163 @@
+import os
+import math
+import numpy as np
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+"""
+Export: Figure rendering away from the GUI.
+        Sinks copy what they show into a FigureSnapshot (plain arrays, picklable),
+        exportProcess redraws it in a child process with the Agg backend.
+        Stills: .png .svg .pdf at the newest time.
+        Time-lapse: .mp4 (needs ffmpeg) .gif, frames slide the snapshot's window
+        across the recorded span.
+        A snapshot with panels is a grid of subplots, one panel per FigureSnapshot.
+        Never imports Qt, the child process starts from common.exportMain and stays light.
+"""
+
+EXPORT_STILL_FORMATS = (".png", ".svg", ".pdf")
+EXPORT_MOVIE_FORMATS = (".mp4", ".gif")
+EXPORT_DPI = 150
+EXPORT_FPS = 20
+EXPORT_FRAMES = 200 # time-lapse length, 10s at EXPORT_FPS
+
+@dataclass
+class ArtistSnapshot():
+    kind: str = "line" # line, scatter or bar
+    label: str = ""
+    y: np.ndarray = field(default_factory=lambda: np.empty(0))
+    t: Optional[np.ndarray] = None # per sample time, None for a static artist drawn whole in every frame
+    x: Optional[np.ndarray] = None # None plots y against t relative to the frame time
+    tail: int = 0 # only the newest tail samples of a frame, 0 for all
+    style: dict = field(default_factory=dict) # matplotlib kwargs
+
+@dataclass
+class FigureSnapshot():
+    title: str = ""
+    xlabel: str = ""
+    ylabel: str = ""
+    xlim: Optional[tuple[float, float]] = None
+    ylim: Optional[tuple[float, float]] = None
+    artists: list[ArtistSnapshot] = field(default_factory=list)
+    window: float = np.inf # time shown per frame, same units as ArtistSnapshot.t
+    legend: bool = True
+    theme: str = "bmh" # matplotlib style
+    figsize: tuple[float, float] = (8, 5)
+    dpi: int = EXPORT_DPI
+    fps: int = EXPORT_FPS
+    frames: int = EXPORT_FRAMES
+    panels: list["FigureSnapshot"] = field(default_factory=list) # subplots, each with its own artists and limits
+    columns: int = 1 # panels per row
+
+    def span(self) -> tuple[float, float]:
+        """First and last time over every timed artist, (0, 0) when there are none."""
+        artists = self.artists + [a for panel in self.panels for a in panel.artists]
+        times = [a.t for a in artists if a.t is not None and len(a.t)]
+        if not times:
+            return 0.0, 0.0
+        return min(float(t[0]) for t in times), max(float(t[-1]) for t in times)
+
+def _bounds(artist: ArtistSnapshot, tFrame: float, window: float) -> tuple[int, int]:
+    if artist.t is None:
+        return 0, len(artist.y)
+    i0 = int(np.searchsorted(artist.t, tFrame - window, side="left"))
+    i1 = int(np.searchsorted(artist.t, tFrame, side="right"))
+    if artist.tail:
+        i0 = max(i0, i1 - artist.tail)
+    return i0, i1
+
+def _buildAxes(ax, snapshot: FigureSnapshot) -> Callable[[float], list]:
+    """Artists of one panel plus an update(tFrame) that moves them to a frame time."""
+    ax.set_title(snapshot.title)
+    ax.set_xlabel(snapshot.xlabel)
+    ax.set_ylabel(snapshot.ylabel)
+    handles = list()
+    barLabels = list()
+    for artist in snapshot.artists:
+        if artist.kind == "line":
+            handle, = ax.plot([], [], label=artist.label, **artist.style)
+        elif artist.kind == "scatter":
+            handle = ax.scatter([], [], label=artist.label, **artist.style)
+        elif artist.kind == "bar":
+            handle = ax.bar([len(barLabels)], [0.0], **artist.style).patches[0]
+            barLabels.append(artist.label)
+        else:
+            raise ValueError(f"Unknown artist kind {artist.kind}")
+        handles.append(handle)
+    if barLabels:
+        ax.set_xticks(np.arange(len(barLabels)), [label.rsplit("/", 1)[-1] for label in barLabels],
+                      rotation=45, ha="right")
+    if snapshot.xlim is not None:
+        ax.set_xlim(snapshot.xlim)
+    if snapshot.ylim is not None:
+        ax.set_ylim(snapshot.ylim)
+    if snapshot.legend and any(a.kind != "bar" and a.label for a in snapshot.artists):
+        ax.legend(loc=1)
+
+    def update(tFrame: float):
+        for artist, handle in zip(snapshot.artists, handles):
+            i0, i1 = _bounds(artist, tFrame, snapshot.window)
+            ys = artist.y[i0:i1]
+            if artist.kind == "line":
+                xs = artist.t[i0:i1] - tFrame if artist.x is None else artist.x[i0:i1]
+                handle.set_data(xs, ys)
+            elif artist.kind == "scatter":
+                handle.set_offsets(np.column_stack((artist.x[i0:i1], ys)))
+            else:
+                handle.set_height(float(ys[-1]) if len(ys) else 0.0)
+        return handles
+    return update
+
+def _build(snapshot: FigureSnapshot, plt) -> tuple:
+    """Figure plus an update(tFrame) that moves every panel to a frame time."""
+    plt.style.use(snapshot.theme)
+    panels = snapshot.panels or [snapshot]
+    columns = max(1, min(snapshot.columns, len(panels)))
+    rows = math.ceil(len(panels) / columns)
+    fig, axes = plt.subplots(rows, columns, figsize=snapshot.figsize, dpi=snapshot.dpi, squeeze=False)
+    updates = [_buildAxes(ax, panel) for ax, panel in zip(axes.flat, panels)]
+    for ax in axes.flat[len(panels):]:
+        ax.set_visible(False)
+    if snapshot.panels:
+        fig.suptitle(snapshot.title)
+    fig.tight_layout()
+
+    def update(tFrame: float):
+        return [handle for panelUpdate in updates for handle in panelUpdate(tFrame)]
+    return fig, update
+
+def renderSnapshot(snapshot: FigureSnapshot, path: str, progress: Callable[[int, int], None]):
+    import matplotlib
+    matplotlib.use("Agg") # before pyplot, the child never touches Qt
+    import matplotlib.pyplot as plt
+    from matplotlib import animation
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_STILL_FORMATS + EXPORT_MOVIE_FORMATS:
+        raise ValueError(f"Unsupported export format {ext}")
+    fig, update = _build(snapshot, plt)
+    t0, t1 = snapshot.span()
+    if ext in EXPORT_STILL_FORMATS:
+        progress(0, 1)
+        update(t1)
+        fig.savefig(path)
+        progress(1, 1)
+    else:
+        if ext == ".gif":
+            writer = animation.PillowWriter(fps=snapshot.fps)
+        elif animation.writers.is_available("ffmpeg"):
+            writer = animation.FFMpegWriter(fps=snapshot.fps)
+        else:
+            raise RuntimeError("MP4 export needs ffmpeg on the PATH")
+        times = np.linspace(min(t0 + snapshot.window, t1), t1, max(1, snapshot.frames)) # first frame shows a full window
+        anim = animation.FuncAnimation(fig, lambda i: update(times[i]), frames=len(times), blit=False)
+        anim.save(path, writer=writer, progress_callback=lambda i, n: progress(i + 1, n))
+    plt.close(fig)
+
+def exportProcess(snapshot: FigureSnapshot, path: str, queue):
+    """Child process entry, reports ("progress", done, total) then ("done", path) or ("error", message)."""
+    try:
+        renderSnapshot(snapshot, path, lambda done, total: queue.put(("progress", done, total)))
+        queue.put(("done", path))
+    except Exception as e:
+        queue.put(("error", f"{type(e).__name__}: {e}"))
@@ -0,0 +1,7 @@
+from common.export import exportProcess
+
+"""
+exportMain: __main__ of the export child process.
+        ExportService spawns from this module instead of the GUI's entry script,
+        the child imports common.export and nothing of Qt.
+"""
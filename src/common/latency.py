@@ -0,0 +1,118 @@
+import json
+import time
+import threading
+import numpy as np
+from typing import Optional
+
+from common.logger import getmylogger
+from common.zmqutils import ZmqPub, Transport, Endpoint
+
+"""
+Latency: Per stage latency histograms of the telemetry path.
+        network  -- timestamp frame -> hub receive. Publisher clocks are not synced
+                    with the host so this is the delay above the fastest sample seen
+                    since reset, i.e. queueing and jitter rather than wire time.
+                    Only decoded frames of Topic.wallClock topics are counted, their
+                    stamps scaled by Topic.timeScale.
+        decode   -- hub receive -> payload decoded
+        delivery -- decoded -> handed to the GUI thread by ZmqBridgeQt
+        draw     -- handed to the GUI -> matplotlib draw_event
+        Stages are recorded from any thread, use LatencyMonitor.instance().
+"""
+
+LATENCY_ENABLED = True
+LATENCY_STAGES = ("network", "decode", "delivery", "draw")
+LATENCY_BIN_EDGES = np.logspace(-6, 1, 141) # 1us .. 10s, 20 bins per decade, seconds
+PUBLISH_CLOCK_SCALE = 1.0 # default timestamp frame units -> seconds, host publishers send time.time()
+STATS_TOPIC = "STATS/LATENCY"
+
+class LatencyHistogram():
+    """Log binned histogram, percentiles resolve to a bin's upper edge capped at the max seen."""
+    def __init__(self, edges: np.ndarray = LATENCY_BIN_EDGES):
+        self.edges = edges
+        self.counts = np.zeros(len(edges) + 1, dtype=np.int64) # plus under / overflow
+        self.max = 0.0
+
+    def add(self, values: np.ndarray):
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return
+        self.counts += np.bincount(np.searchsorted(self.edges, values), minlength=len(self.counts))
+        self.max = max(self.max, float(values.max()))
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def percentile(self, q: float) -> float:
+        total = self.count
+        if total == 0:
+            return 0.0
+        i = int(np.searchsorted(np.cumsum(self.counts), q / 100 * total))
+        return min(float(self.edges[min(i, len(self.edges) - 1)]), self.max)
+
+    def summary(self) -> dict[str, float]:
+        return {"count": self.count, "p50": self.percentile(50), "p99": self.percentile(99),
+                "p999": self.percentile(99.9), "max": self.max}
+
+def parseStamp(timestamp: str, scale: float = PUBLISH_CLOCK_SCALE) -> float:
+    """Timestamp frame in seconds, NaN where unparsable."""
+    try:
+        return float(timestamp) * scale
+    except ValueError:
+        return np.nan
+
+class LatencyMonitor():
+    """Process wide stage histograms, use LatencyMonitor.instance()."""
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self):
+        self.log = getmylogger(__name__)
+        self.lock = threading.Lock()
+        self.histograms = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+        self.minDelay = np.inf # fastest timestamp -> receive delay, absorbs the clock offset
+        self.publisher: Optional[ZmqPub] = None
+
+    @classmethod
+    def instance(cls) -> "LatencyMonitor":
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def record(self, stage: str, values: np.ndarray):
+        with self.lock:
+            self.histograms[stage].add(np.asarray(values, dtype=np.float64))
+
+    def recordNetwork(self, received: float, stamps: np.ndarray):
+        delays = received - stamps
+        delays = delays[np.isfinite(delays)]
+        if len(delays) == 0:
+            return
+        with self.lock:
+            self.minDelay = min(self.minDelay, float(delays.min()))
+            self.histograms["network"].add(delays - self.minDelay)
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {stage: LatencyHistogram() for stage in LATENCY_STAGES}
+            self.minDelay = np.inf
+
+    def snapshot(self) -> dict[str, tuple[np.ndarray, dict[str, float]]]:
+        """stage -> (bin counts copy, summary)"""
+        with self.lock:
+            return {stage: (h.counts.copy(), h.summary()) for stage, h in self.histograms.items()}
+
+    def publish(self, transport: Transport = Transport.IPC, endpoint: Endpoint = Endpoint.STATS):
+        """Send the stage summaries as JSON on STATS_TOPIC, binds on first call."""
+        if self.publisher is None:
+            self.publisher = ZmqPub(transport, endpoint)
+            self.publisher.bind()
+        summary = {stage: stats for stage, (_, stats) in self.snapshot().items()}
+        self.publisher.sendTimestamped(STATS_TOPIC, json.dumps(summary), str(time.time()))
+
+    def close(self):
+        if self.publisher is not None:
+            self.publisher.close()
+            self.publisher = None
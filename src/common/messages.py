@@ -102,15 +102,19 @@ class Topic:
     delim: str = ":"  # Delimiter
     format: str = ""  # Data format
     nArgs: int = 0  # Number of arguments
+    timeScale: float = 1.0  # Timestamp frame units -> seconds
+    wallClock: bool = True  # Timestamp frame is host synced epoch time, else no network latency is recorded
 
 @dataclass
 class TopicMap:
     topics: Dict[str, Topic] = field(default_factory=dict)
     names_to_ids: Dict[str, str] = field(default_factory=dict)
 
-    def register(self, topic_name: str, topic_id: str, topic_args: List[str], delim: str):
+    def register(self, topic_name: str, topic_id: str, topic_args: List[str], delim: str,
+                 timeScale: float = 1.0, wallClock: bool = True):
         """Register a new topic."""
-        topic = Topic(ID=topic_id, name=topic_name, args=topic_args, delim=delim, nArgs=len(topic_args) if delim else 0)
+        topic = Topic(ID=topic_id, name=topic_name, args=topic_args, delim=delim, nArgs=len(topic_args) if delim else 0,
+                      timeScale=timeScale, wallClock=wallClock)
         self.topics[topic_id] = topic
         self.names_to_ids[topic_name] = topic_id
 
@@ -132,7 +136,9 @@ class TopicMap:
                         args=args,
                         delim=":",  # Default delimiter
                         format=publisher.get('format', ''),
-                        nArgs=len(args)
+                        nArgs=len(args),
+                        timeScale=publisher.get('timeScale', 1.0),
+                        wallClock=publisher.get('wallClock', True)
                     )
 
                     self.topics[topic.ID] = topic
@@ -143,6 +149,13 @@ class TopicMap:
         topic_id = self.names_to_ids.get(name)
         return self.topics.get(topic_id) if topic_id else None
 
+    def get_topic_by_series(self, series: str) -> Optional[Topic]:
+        """Get topic owning a data series, either the topic name or topic/arg."""
+        topic = self.get_topic_by_name(series)
+        if topic is None and "/" in series:
+            topic = self.get_topic_by_name(series.rsplit("/", 1)[0])
+        return topic
+
     def get_topic_format(self, name: str) -> Tuple[Optional[str], Optional[List[str]]]:
         """Get the format of a topic."""
         topic = self.get_topic_by_name(name)
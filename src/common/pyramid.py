@@ -0,0 +1,95 @@
+import numpy as np
+from typing import Optional
+
+from common.ringBuffer import RingBuffer
+
+"""
+HistoryPyramid: Downsampled tiers of a multi field series for zoomed out views.
+        Tier k closes a bucket every factors[k] raw samples and keeps its start time
+        and per field min, max and mean. Each tier is fed by the buckets the tier
+        below closes, so an append costs a few in place ufuncs whatever the depth.
+        Tiers are fixed capacity rings, memory is bounded however long the session,
+        e.g. 4096 buckets of 1000 samples is 2.3 hours at 500Hz.
+        Factors must each divide the next.
+"""
+
+PYRAMID_FACTORS = (10, 100, 1000) # raw samples per bucket of each tier
+PYRAMID_CAPACITY = 4096 # buckets kept per tier
+
+class PyramidTier():
+    """Closed buckets as (start, min x fields, max x fields, mean x fields) plus the open bucket."""
+    def __init__(self, factor: int, fields: int, capacity: int = PYRAMID_CAPACITY):
+        self.factor = factor
+        self.fields = fields
+        self.ring = RingBuffer(capacity, fields=1 + 3 * fields)
+        self.row = np.empty(1 + 3 * fields, dtype=np.float64)
+        self.lo = np.empty(fields, dtype=np.float64)
+        self.hi = np.empty(fields, dtype=np.float64)
+        self.total = np.empty(fields, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        self.count = 0 # raw samples in the open bucket
+        self.start = np.nan
+        self.end = np.nan # time of the newest raw sample inside a closed bucket
+
+    def clear(self):
+        self.ring.clear()
+        self.reset()
+
+    def columns(self, field: int) -> tuple[int, int, int]:
+        """Rows of a field's min, max and mean in a view."""
+        return 1 + field, 1 + self.fields + field, 1 + 2 * self.fields + field
+
+    def add(self, start: float, end: float, lo: np.ndarray, hi: np.ndarray, mean: np.ndarray, weight: int) -> bool:
+        """Merge weight raw samples spanning start..end, True when that closed a bucket."""
+        if self.count == 0:
+            self.start = start
+            self.lo[:] = lo
+            self.hi[:] = hi
+            np.multiply(mean, weight, out=self.total)
+        else:
+            np.fmin(self.lo, lo, out=self.lo) # fmin / fmax skip NaN
+            np.fmax(self.hi, hi, out=self.hi)
+            self.total += mean * weight
+        self.count += weight
+        if self.count < self.factor:
+            return False
+        f = self.fields
+        self.row[0] = self.start
+        self.row[1:1 + f] = self.lo
+        self.row[1 + f:1 + 2 * f] = self.hi
+        self.row[1 + 2 * f:] = self.total / self.count
+        self.ring.append(self.row)
+        self.end = end
+        self.count = 0
+        return True
+
+class HistoryPyramid():
+    def __init__(self, fields: int, factors: tuple[int, ...] = PYRAMID_FACTORS, capacity: int = PYRAMID_CAPACITY):
+        self.fields = fields
+        self.tiers = [PyramidTier(factor, fields, capacity) for factor in factors]
+
+    def add(self, t: float, values: np.ndarray):
+        start, lo, hi, mean, weight = t, values, values, values, 1
+        for tier in self.tiers:
+            if not tier.add(start, t, lo, hi, mean, weight):
+                return
+            # the closed bucket is one sample of the next tier
+            row = tier.row
+            f = self.fields
+            start, lo, hi, mean, weight = row[0], row[1:1 + f], row[1 + f:1 + 2 * f], row[1 + 2 * f:], tier.factor
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def covering(self, t0: float) -> Optional[PyramidTier]:
+        """Finest tier holding t0, else the coarsest tier with any buckets, None when all are empty."""
+        for tier in self.tiers:
+            if len(tier.ring) and tier.ring.view()[0][0] <= t0:
+                return tier
+        for tier in reversed(self.tiers):
+            if len(tier.ring):
+                return tier
+        return None
@@ -0,0 +1,368 @@
+import io
+import os
+import csv
+import gzip
+import json
+import queue
+import shutil
+import threading
+import numpy as np
+from typing import Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from common.logger import getmylogger
+from common.messages import Topic
+from common.telemHub import TelemFrame
+from common.telemStore import seriesNames
+
+"""
+Recording: Output formats of the recorder.
+        csv      -- one row per frame: topic, timestamp, then the topic's fields in
+                    its own columns, other topics' columns left empty.
+        columnar -- a <name>.rec directory, one raw little endian float64 file per
+                    column under <topic>/ plus schema.json. Samples are buffered per
+                    topic and written a block of columns at a time, reloading is
+                    np.memmap with no parsing. Numeric only, text payloads store NaN.
+        Writers buffer in memory and track their own byte count, nothing reaches
+        disk until a buffer fills or flush() is called, the caller bounds the loss
+        window by flushing on a timer. Not thread safe, RecorderThread owns them.
+        A recording is a series of closed segments <name>_<n><ext> listed in
+        <name>.manifest.json with their time span, rows and topics, so a time range is
+        found without opening any segment. Closed csv segments stay raw so
+        RecordingReader can memory map and index them, SegmentCompressor.archive()
+        compresses a finished recording's csv segments (zstd when zstandard is installed,
+        else gzip). Columnar segments always stay raw.
+"""
+
+RECORDING_FORMATS = ("csv", "columnar")
+COLUMNAR_EXT = ".rec"
+CSV_FLUSH_ROWS = 2048 # csv rows buffered before a block write
+COLUMNAR_CHUNK_ROWS = 4096 # rows buffered per topic before its column block is written
+COLUMNAR_DTYPE = "<f8"
+SCHEMA_FILE = "schema.json"
+MANIFEST_EXT = ".manifest.json"
+INDEX_EXT = ".idx.npz" # RecordingReader's cached index of a csv segment
+COMPRESSION = "zstd" if zstandard is not None else "gzip"
+COMPRESSION_EXT = {"zstd": ".zst", "gzip": ".gz"}
+
+def columnNames(topic: Topic) -> list[str]:
+    """Column files of a topic, the timestamp first."""
+    fields = topic.args[:-1] if topic.nArgs > 1 else ["msg"] # HACK omit timestamp from arg names
+    return ["timestamp", *fields]
+
+class RecordingWriter():
+    def __init__(self, path: str, topics: list[Topic]):
+        self.path = path
+        self.topics = {topic.name: topic for topic in topics}
+        self.bytesWritten = 0
+        self.rows = 0
+        self.start: Optional[float] = None # first and last frame time
+        self.end: Optional[float] = None
+
+    def _mark(self, timestamp: str):
+        self.rows += 1
+        try:
+            t = float(timestamp)
+        except ValueError:
+            return
+        if self.start is None:
+            self.start = t
+        self.end = t
+
+    def write(self, frame: TelemFrame):
+        raise NotImplementedError("Subclasses must implement write method")
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def size(self) -> int:
+        """Bytes flushed so far, drives rotation without a syscall."""
+        return self.bytesWritten
+
+class CsvRecordingWriter(RecordingWriter):
+    def __init__(self, path: str, topics: list[Topic], flushRows: int = CSV_FLUSH_ROWS):
+        super().__init__(path, topics)
+        self.file = open(path, 'w', newline='')
+        self.block = io.StringIO() # rows are formatted here and written in one call
+        self.writer = csv.writer(self.block)
+        self.pending = 0
+        self.flushRows = flushRows
+        headers = ["topic", "timestamp"]
+        spans = dict()
+        for topic in self.topics.values():
+            names = seriesNames(topic)
+            spans[topic.name] = (len(headers) - 2, len(names))
+            headers.extend(names)
+        width = len(headers) - 2
+        self.padding = {name: ([""] * start, [""] * (width - start - n)) for name, (start, n) in spans.items()}
+        self.writer.writerow(headers)
+        self.flush()
+
+    def write(self, frame: TelemFrame):
+        before, after = self.padding[frame.topic.name]
+        self.writer.writerow([frame.topic.name, frame.timestamp, *before, *frame.values, *after])
+        self._mark(frame.timestamp)
+        self.pending += 1
+        if self.pending >= self.flushRows:
+            self.flush()
+
+    def flush(self):
+        text = self.block.getvalue()
+        if text:
+            self.bytesWritten += self.file.write(text) # ASCII telemetry, chars == bytes
+            self.block.seek(0)
+            self.block.truncate()
+            self.pending = 0
+        self.file.flush()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+class TopicColumnChunk():
+    """Column major staging buffer of one topic, (columns, COLUMNAR_CHUNK_ROWS)."""
+    def __init__(self, topic: Topic, directory: str, chunkRows: int = COLUMNAR_CHUNK_ROWS):
+        self.topic = topic
+        self.columns = columnNames(topic)
+        self.buffer = np.empty((len(self.columns), chunkRows), dtype=COLUMNAR_DTYPE)
+        self.count = 0 # buffered rows
+        self.rows = 0 # rows on disk
+        os.makedirs(os.path.join(directory, topic.name), exist_ok=True)
+        self.files = [open(os.path.join(directory, topic.name, f"{column}.f64"), 'wb') for column in self.columns]
+
+    def append(self, timestamp: str, values) -> bool:
+        """False when the buffer is full and must be flushed."""
+        i = self.count
+        try:
+            self.buffer[0, i] = float(timestamp)
+        except ValueError:
+            self.buffer[0, i] = np.nan
+        try:
+            self.buffer[1:, i] = values # str -> float64 conversion in C
+        except ValueError: # text or malformed payload
+            self.buffer[1:, i] = np.nan
+        self.count += 1
+        return self.count < self.buffer.shape[1]
+
+    def flush(self) -> int:
+        """Write the buffered block, returns the bytes written."""
+        n = self.count
+        if n == 0:
+            return 0
+        for file, column in zip(self.files, self.buffer):
+            column[:n].tofile(file)
+        self.count = 0
+        self.rows += n
+        return n * self.buffer.itemsize * len(self.files)
+
+    def close(self):
+        for file in self.files:
+            file.close()
+
+class ColumnarRecordingWriter(RecordingWriter):
+    def __init__(self, path: str, topics: list[Topic], chunkRows: int = COLUMNAR_CHUNK_ROWS):
+        super().__init__(path, topics)
+        os.makedirs(path, exist_ok=True)
+        self.chunks = {topic.name: TopicColumnChunk(topic, path, chunkRows) for topic in self.topics.values()}
+        self.writeSchema()
+
+    def writeSchema(self):
+        schema = {"format": "columnar", "dtype": COLUMNAR_DTYPE, "topics": {
+            name: {"columns": chunk.columns, "series": list(seriesNames(chunk.topic)), "rows": chunk.rows}
+            for name, chunk in self.chunks.items()}}
+        with open(os.path.join(self.path, SCHEMA_FILE), 'w') as f:
+            json.dump(schema, f, indent=2)
+
+    def write(self, frame: TelemFrame):
+        chunk = self.chunks[frame.topic.name]
+        self._mark(frame.timestamp)
+        if not chunk.append(frame.timestamp, frame.values):
+            self.bytesWritten += chunk.flush()
+
+    def flush(self):
+        for chunk in self.chunks.values():
+            self.bytesWritten += chunk.flush()
+            for file in chunk.files:
+                file.flush()
+
+    def close(self):
+        self.flush()
+        for chunk in self.chunks.values():
+            chunk.close()
+        self.writeSchema() # final row counts
+
+class RecordingManifest():
+    """
+    Closed segments of a recording, rewritten whole on every change. Thread safe, use
+    RecordingManifest.open() so the recorder and the compressor share one copy per file.
+    """
+    _manifests: dict[str, "RecordingManifest"] = dict()
+    _instanceLock = threading.Lock()
+
+    def __init__(self, filename: str):
+        base, self.ext = os.path.splitext(filename)
+        self.base = base
+        self.path = base + MANIFEST_EXT
+        self.directory = os.path.dirname(filename)
+        self.lock = threading.Lock()
+        self.segments: list[dict] = list()
+        self.next = 0 # index of the next segment name
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.segments = data["segments"]
+            self.next = data["next"]
+
+    @classmethod
+    def open(cls, filename: str) -> "RecordingManifest":
+        """filename is the recording, <name>.csv, or its base name as readers know it."""
+        key, ext = os.path.splitext(os.path.abspath(filename))
+        with cls._instanceLock:
+            manifest = cls._manifests.get(key)
+            if manifest is None:
+                manifest = cls._manifests[key] = cls(filename)
+            elif ext and not manifest.ext: # opened by a reader first
+                manifest.ext = ext
+            return manifest
+
+    def _save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump({"next": self.next, "segments": self.segments}, f, indent=2)
+        os.replace(tmp, self.path) # readers never see a torn manifest
+
+    def add(self, writer: RecordingWriter, fmt: str) -> dict:
+        """Move a closed writer's output to the next segment name and list it."""
+        with self.lock:
+            ext = COLUMNAR_EXT if fmt == "columnar" else self.ext
+            path = f"{self.base}_{self.next}{ext}"
+            os.replace(writer.path, path)
+            segment = {"path": os.path.basename(path), "format": fmt, "start": writer.start, "end": writer.end,
+                       "rows": writer.rows, "bytes": writer.size(), "topics": list(writer.topics), "compressed": None}
+            self.segments.append(segment)
+            self.next += 1
+            self._save()
+            return segment
+
+    def compressed(self, segment: dict, path: str, method: str):
+        with self.lock:
+            segment["path"] = os.path.basename(path)
+            segment["compressed"] = method
+            segment["bytes"] = os.path.getsize(path)
+            self._save()
+
+    def segmentPath(self, segment: dict) -> str:
+        return os.path.join(self.directory, segment["path"])
+
+    def find(self, t0: float, t1: float, topic: Optional[str] = None) -> list[dict]:
+        """Segments overlapping t0..t1, optionally only those holding topic."""
+        with self.lock:
+            return [s for s in self.segments if s["start"] is not None and s["start"] <= t1 and s["end"] >= t0
+                    and (topic is None or topic in s["topics"])]
+
+class SegmentCompressor():
+    """Compresses closed segments off the recorder thread, use SegmentCompressor.instance()."""
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self, method: str = COMPRESSION):
+        self.log = getmylogger(__name__)
+        self.method = method
+        self.jobs = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "SegmentCompressor":
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def submit(self, manifest: RecordingManifest, segment: dict):
+        self.jobs.put((manifest, segment))
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                # not a daemon, interpreter exit waits for queued segments
+                self.thread = threading.Thread(target=self._run, name="SegmentCompressor")
+                self.thread.start()
+
+    def archive(self, manifest: RecordingManifest) -> int:
+        """Queue every raw csv segment of a recording, returns how many."""
+        with manifest.lock:
+            segments = [s for s in manifest.segments if s["format"] == "csv" and s["compressed"] is None]
+        for segment in segments:
+            self.submit(manifest, segment)
+        return len(segments)
+
+    def wait(self):
+        self.jobs.join()
+
+    def _run(self):
+        while True:
+            try:
+                manifest, segment = self.jobs.get(timeout=1.0)
+            except queue.Empty:
+                return
+            try:
+                self._compress(manifest, segment)
+            except Exception as e:
+                self.log.error(f"Compressing {segment['path']} failed: {e}")
+            finally:
+                self.jobs.task_done()
+
+    def _compress(self, manifest: RecordingManifest, segment: dict):
+        if segment["compressed"] is not None: # archived twice
+            return
+        src = manifest.segmentPath(segment)
+        dst = src + COMPRESSION_EXT[self.method]
+        tmp = dst + ".tmp"
+        with open(src, 'rb') as fin, open(tmp, 'wb') as fout:
+            if self.method == "zstd":
+                zstandard.ZstdCompressor().copy_stream(fin, fout)
+            else:
+                with gzip.GzipFile(fileobj=fout, mode='wb', compresslevel=6) as gz:
+                    shutil.copyfileobj(fin, gz)
+        os.replace(tmp, dst)
+        manifest.compressed(segment, dst, self.method)
+        os.remove(src)
+        if os.path.exists(src + INDEX_EXT):
+            os.remove(src + INDEX_EXT)
+        self.log.info(f"Compressed {src} {segment['bytes']}B")
+
+def openSegment(path: str, method: Optional[str]):
+    """Binary file object of a csv segment, decompressing on the fly."""
+    if method == "zstd":
+        # the raw stream reader cannot be iterated by line, buffer it like gzip's
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    if method == "gzip":
+        return gzip.open(path, 'rb')
+    return open(path, 'rb')
+
+def openRecording(fmt: str, path: str, topics: list[Topic]) -> RecordingWriter:
+    """Writer for fmt, columnar recordings live in a directory named after path."""
+    if fmt == "csv":
+        return CsvRecordingWriter(path, topics)
+    if fmt == "columnar":
+        return ColumnarRecordingWriter(os.path.splitext(path)[0] + COLUMNAR_EXT, topics)
+    raise ValueError(f"Unknown recording format {fmt}")
+
+def mapColumnar(path: str) -> dict[str, dict[str, np.memmap]]:
+    """topic -> column -> read only memmap of a columnar recording, rows from the file sizes."""
+    with open(os.path.join(path, SCHEMA_FILE), 'r') as f:
+        schema = json.load(f)
+    dtype = np.dtype(schema["dtype"])
+    topics = dict()
+    for name, entry in schema["topics"].items():
+        files = [os.path.join(path, name, f"{column}.f64") for column in entry["columns"]]
+        rows = min(os.path.getsize(file) for file in files) // dtype.itemsize # a crash may leave a torn block
+        topics[name] = {column: (np.memmap(file, dtype=dtype, mode='r', shape=(rows,)) if rows else np.empty(0, dtype))
+                        for column, file in zip(entry["columns"], files)}
+    return topics
@@ -0,0 +1,225 @@
+import os
+import csv
+import mmap
+import numpy as np
+from typing import Optional
+
+from common.logger import getmylogger
+from common.recording import RecordingManifest, MANIFEST_EXT, INDEX_EXT, COMPRESSION_EXT, SCHEMA_FILE, openSegment, mapColumnar
+
+"""
+RecordingReader: Random access to (topic, field, t0..t1) of a recording.
+        csv segments are memory mapped. A sparse index holds the time and byte offset
+        of the first, every INDEX_STRIDE-th and the last row of each topic, so a
+        query jumps to the row before t0 and parses no further than the index entry
+        after t1. The index is cached as <segment>.idx.npz and rebuilt when the
+        segment's size or mtime changes.
+        Columnar segments need no index, their timestamp column is memory mapped and
+        binary searched, the slice is returned as views of the column files.
+        Archived (compressed) segments cannot be mapped and are parsed whole. A manifest narrows
+        a query to the segments overlapping t0..t1 before any of them is opened.
+        Times must not decrease within a topic of a segment, as recorded.
+"""
+
+INDEX_STRIDE = 256 # rows of a topic per index entry, bounds the rows parsed outside a slice
+
+class CsvSegmentReader():
+    def __init__(self, path: str):
+        self.log = getmylogger(__name__)
+        self.path = path
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = self.map.readline()
+        self.headers = next(csv.reader([header.decode()]))
+        self.start = len(header) # first data row
+        self.loadIndex()
+
+    def loadIndex(self):
+        stat = os.stat(self.path)
+        cache = self.path + INDEX_EXT
+        if os.path.exists(cache):
+            with np.load(cache) as index:
+                if index["size"] == stat.st_size and index["mtime"] == stat.st_mtime_ns:
+                    self.setIndex(list(index["topics"]), index["topic"], index["time"], index["offset"])
+                    return
+        self.buildIndex()
+        try:
+            np.savez(cache, topics=np.array(self.topics, dtype=str), topic=self.entryTopic, time=self.entryTime,
+                     offset=self.entryOffset, size=stat.st_size, mtime=stat.st_mtime_ns)
+        except OSError as e: # read only recording, keep the index in memory
+            self.log.warning(f"Index not cached for {self.path}: {e}")
+
+    def buildIndex(self):
+        """One pass over the rows, only the topic and timestamp of each are parsed."""
+        topics, counts, last = dict(), dict(), dict()
+        entryTopic, entryTime, entryOffset = list(), list(), list()
+        pos, end = self.start, len(self.map)
+        while pos < end:
+            nl = self.map.find(b'\n', pos)
+            nl = end if nl < 0 else nl
+            name, stamp = self.map[pos:nl].split(b',', 2)[:2]
+            name = name.decode()
+            i = topics.setdefault(name, len(topics))
+            try:
+                t = float(stamp)
+            except ValueError:
+                t = np.nan
+            n = counts.get(name, 0)
+            if n % INDEX_STRIDE == 0:
+                entryTopic.append(i); entryTime.append(t); entryOffset.append(pos)
+            else:
+                last[name] = (i, t, pos)
+            counts[name] = n + 1
+            pos = nl + 1
+        for i, t, offset in last.values(): # the last row of a topic closes its final block
+            entryTopic.append(i); entryTime.append(t); entryOffset.append(offset)
+        self.setIndex(list(topics), np.array(entryTopic, dtype=np.int32), np.array(entryTime, dtype=np.float64),
+                      np.array(entryOffset, dtype=np.int64))
+
+    def setIndex(self, topics: list[str], topic: np.ndarray, times: np.ndarray, offsets: np.ndarray):
+        self.topics = topics
+        self.entryTopic, self.entryTime, self.entryOffset = topic, times, offsets
+        self.index = dict()
+        for i, name in enumerate(topics):
+            mask = topic == i
+            order = np.argsort(offsets[mask], kind="stable")
+            self.index[name] = (times[mask][order], offsets[mask][order])
+
+    def span(self, topic: Optional[str] = None) -> tuple[float, float]:
+        names = [topic] if topic is not None else self.topics
+        times = [self.index[name][0] for name in names if name in self.index]
+        if not times:
+            return np.nan, np.nan
+        return min(float(np.nanmin(t)) for t in times), max(float(np.nanmax(t)) for t in times)
+
+    def read(self, topic: str, field: Optional[str], t0: float, t1: float) -> tuple[np.ndarray, np.ndarray]:
+        empty = np.empty(0), np.empty(0)
+        entry = self.index.get(topic)
+        if entry is None:
+            return empty
+        column = self.headers.index(f"{topic}/{field}" if field else topic)
+        times, offsets = entry
+        i = max(int(np.searchsorted(times, t0, side="right")) - 1, 0)
+        j = int(np.searchsorted(times, t1, side="right"))
+        pos = int(offsets[i])
+        stop = int(offsets[j]) if j < len(offsets) else int(offsets[-1]) + 1
+        prefix = topic.encode() + b','
+        stamps, values = list(), list()
+        while pos < stop:
+            nl = self.map.find(b'\n', pos)
+            nl = len(self.map) if nl < 0 else nl
+            if self.map[pos:pos + len(prefix)] == prefix:
+                row = splitRow(self.map[pos:nl])
+                t = float(row[1])
+                if t > t1:
+                    break
+                if t >= t0:
+                    stamps.append(t)
+                    values.append(row[column])
+            pos = nl + 1
+        return np.array(stamps, dtype=np.float64), parseValues(values)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+class StreamSegmentReader():
+    """Compressed csv segment, parsed whole on every read."""
+    def __init__(self, path: str, compressed: str):
+        self.path = path
+        self.compressed = compressed
+
+    def read(self, topic: str, field: Optional[str], t0: float, t1: float) -> tuple[np.ndarray, np.ndarray]:
+        with openSegment(self.path, self.compressed) as file:
+            lines = iter(file)
+            headers = next(csv.reader([next(lines).decode()]))
+            column = headers.index(f"{topic}/{field}" if field else topic)
+            prefix = topic.encode() + b','
+            stamps, values = list(), list()
+            for line in lines:
+                if line.startswith(prefix):
+                    row = splitRow(line)
+                    t = float(row[1])
+                    if t0 <= t <= t1:
+                        stamps.append(t)
+                        values.append(row[column])
+        return np.array(stamps, dtype=np.float64), parseValues(values)
+
+    def close(self):
+        pass
+
+class ColumnarSegmentReader():
+    def __init__(self, path: str):
+        self.path = path
+        self.topics = mapColumnar(path)
+
+    def read(self, topic: str, field: Optional[str], t0: float, t1: float) -> tuple[np.ndarray, np.ndarray]:
+        columns = self.topics.get(topic)
+        if columns is None:
+            return np.empty(0), np.empty(0)
+        times = columns["timestamp"]
+        i0, i1 = np.searchsorted(times, t0, side="left"), np.searchsorted(times, t1, side="right")
+        return times[i0:i1], columns[field or "msg"][i0:i1] # views of the mapped files
+
+    def close(self):
+        self.topics = dict() # memmaps close once unreferenced
+
+def splitRow(line: bytes) -> list[bytes]:
+    line = line.rstrip(b'\r\n')
+    if b'"' in line: # quoted text field, rare
+        return [field.encode() for field in next(csv.reader([line.decode()]))]
+    return line.split(b',')
+
+def parseValues(values: list[bytes]) -> np.ndarray:
+    """float64 when every value is numeric, else the decoded strings."""
+    try:
+        return np.array(values, dtype=np.bytes_).astype(np.float64) if values else np.empty(0)
+    except ValueError:
+        return np.array([v.decode() for v in values])
+
+def openSegmentReader(path: str, compressed: Optional[str] = None):
+    if os.path.exists(os.path.join(path, SCHEMA_FILE)):
+        return ColumnarSegmentReader(path)
+    if compressed is None:
+        compressed = next((method for method, ext in COMPRESSION_EXT.items() if path.endswith(ext)), None)
+    if compressed is not None:
+        return StreamSegmentReader(path, compressed)
+    return CsvSegmentReader(path)
+
+class RecordingReader():
+    """
+    (t, values) of one field of a topic over t0..t1, from a manifest recording or a
+    single segment. field is the arg name, None for a shallow topic.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.readers = dict() # segment path -> reader, opened on first use
+        manifestPath = path if path.endswith(MANIFEST_EXT) else os.path.splitext(path)[0] + MANIFEST_EXT
+        self.manifest = None
+        if path.endswith(MANIFEST_EXT) or (not os.path.exists(path) and os.path.exists(manifestPath)):
+            self.manifest = RecordingManifest.open(manifestPath[:-len(MANIFEST_EXT)])
+        elif not os.path.exists(path):
+            raise FileNotFoundError(f"No recording at {path}")
+
+    def _reader(self, path: str, compressed: Optional[str] = None):
+        reader = self.readers.get(path)
+        if reader is None:
+            reader = self.readers[path] = openSegmentReader(path, compressed)
+        return reader
+
+    def read(self, topic: str, field: Optional[str] = None, t0: float = -np.inf,
+             t1: float = np.inf) -> tuple[np.ndarray, np.ndarray]:
+        if self.manifest is None:
+            return self._reader(self.path).read(topic, field, t0, t1)
+        parts = [self._reader(self.manifest.segmentPath(s), s["compressed"]).read(topic, field, t0, t1)
+                 for s in self.manifest.find(t0, t1, topic)]
+        if not parts:
+            return np.empty(0), np.empty(0)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate([t for t, _ in parts]), np.concatenate([v for _, v in parts])
+
+    def close(self):
+        for reader in self.readers.values():
+            reader.close()
+        self.readers.clear()
@@ -0,0 +1,178 @@
+import io
+import os
+import csv
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+from typing import Callable, Iterator, Optional
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+from common.logger import getmylogger
+from common.zmqutils import ZmqPub, Transport, Endpoint
+from common.messages import TopicMap
+from common.latency import PUBLISH_CLOCK_SCALE
+from common.recording import RecordingManifest, MANIFEST_EXT, COMPRESSION_EXT, openSegment, mapColumnar
+
+"""
+Replay: Republishes a recording through ZmqPub.sendTimestamped.
+        Accepts a manifest (<name>.manifest.json, or the recorder's <name>.csv once it
+        has been rotated away), a csv segment (plain, .gz or .zst) or a columnar .rec
+        directory. Messages keep their recorded topic, payload and timestamp frame.
+            speed 1  -- original timing
+            speed N  -- N times faster
+            speed 0  -- as fast as possible, load testing
+        Sends are scheduled against the first message so sleep jitter never
+        accumulates. Stamps are converted with each topic's Topic.timeScale, every
+        topic is paced from its own first message so device and host clocks mix. Columnar recordings are numeric only, their text topics are skipped.
+        CLI: python src/common/replay.py recordings/rec0.csv --speed 10
+"""
+
+REPLAY_DELIM = ":" # payload delimiter, see TopicMap.load_topics_from_json
+REPLAY_HWM = 100000 # publisher queue, fast replays must not be dropped at the source
+REPLAY_WARMUP_S = 0.5 # lets subscribers connect before the first message
+REPLAY_MIN_WAIT_S = 0.0005 # shorter waits are sent straight away, the schedule catches up
+REPLAY_PROGRESS_S = 0.25
+
+def formatStamp(t: float) -> str:
+    return str(int(t)) if t.is_integer() else repr(t)
+
+def readCsv(file) -> Iterator[tuple[float, str, str, str]]:
+    """(time, topic, payload, timestamp) of every row of a recorder csv segment."""
+    reader = csv.reader(io.TextIOWrapper(file, newline=''))
+    headers = next(reader, None)
+    if headers is None or headers[:2] != ["topic", "timestamp"]:
+        raise ValueError("Not a recorder csv, expected topic and timestamp columns")
+    spans = dict() # topic -> its columns
+    for row in reader:
+        topic = row[0]
+        span = spans.get(topic)
+        if span is None:
+            cols = [i for i, name in enumerate(headers) if i > 1 and (name == topic or name.startswith(topic + "/"))]
+            span = spans[topic] = (cols[0], cols[-1] + 1) if cols else (2, 2)
+        try:
+            t = float(row[1])
+        except ValueError:
+            t = np.nan
+        yield t, topic, REPLAY_DELIM.join(row[span[0]:span[1]]), row[1]
+
+def readColumnar(path: str) -> Iterator[tuple[float, str, str, str]]:
+    """(time, topic, payload, timestamp) of a columnar recording, topics merged in time order."""
+    topics = mapColumnar(path)
+    names = list(topics)
+    if not names:
+        return
+    times = np.concatenate([topics[name]["timestamp"] for name in names])
+    owner = np.concatenate([np.full(len(topics[name]["timestamp"]), i) for i, name in enumerate(names)])
+    index = np.concatenate([np.arange(len(topics[name]["timestamp"])) for name in names])
+    order = np.argsort(times, kind="stable")
+    values = [np.column_stack([c for k, c in topics[name].items() if k != "timestamp"]) for name in names]
+    for i in order:
+        row = values[owner[i]][index[i]]
+        if np.isnan(row).all(): # text topic, not kept by the columnar format
+            continue
+        t = float(times[i])
+        yield t, names[owner[i]], REPLAY_DELIM.join(map(repr, row.tolist())), formatStamp(t)
+
+def readSegment(path: str, compressed: Optional[str] = None) -> Iterator[tuple[float, str, str, str]]:
+    if os.path.isdir(path):
+        yield from readColumnar(path)
+        return
+    if compressed is None:
+        compressed = next((method for method, ext in COMPRESSION_EXT.items() if path.endswith(ext)), None)
+    with openSegment(path, compressed) as file:
+        yield from readCsv(file)
+
+def readRecording(path: str) -> Iterator[tuple[float, str, str, str]]:
+    """Every message of a recording in recorded order, segments listed by a manifest are chained."""
+    manifestPath = path if path.endswith(MANIFEST_EXT) else os.path.splitext(path)[0] + MANIFEST_EXT
+    if path.endswith(MANIFEST_EXT) or (not os.path.exists(path) and os.path.exists(manifestPath)):
+        manifest = RecordingManifest.open(manifestPath[:-len(MANIFEST_EXT)])
+        for segment in manifest.segments:
+            yield from readSegment(manifest.segmentPath(segment), segment["compressed"])
+        return
+    if os.path.exists(path):
+        yield from readSegment(path)
+        return
+    raise FileNotFoundError(f"No recording at {path}")
+
+class Replay():
+    """Publishes a recording on pub, run() blocks until the end or stop is set."""
+    def __init__(self, path: str, pub: ZmqPub, speed: float = 1.0, topicMap: Optional[TopicMap] = None,
+                 restamp: bool = False):
+        self.log = getmylogger(__name__)
+        self.path = path
+        self.pub = pub
+        self.speed = speed # 0 sends as fast as possible
+        self.topicMap = topicMap # each topic's timeScale, PUBLISH_CLOCK_SCALE for topics it does not list
+        self.restamp = restamp # send time.time() instead of the recorded stamp
+        self.stop = threading.Event()
+        self.sent = 0
+
+    def timeScale(self, topicname: str) -> float:
+        topic = self.topicMap.get_topic_by_name(topicname) if self.topicMap is not None else None
+        return topic.timeScale if topic is not None else PUBLISH_CLOCK_SCALE
+
+    def run(self, progress: Optional[Callable[[int, float], None]] = None) -> int:
+        """Messages sent, progress(sent, recording seconds replayed) is called every REPLAY_PROGRESS_S."""
+        origins = dict() # topic -> (first stamp, recording seconds it was sent at), topics may run on their own clocks
+        scales = dict()
+        due = 0.0 # recording seconds of the latest message, never decreases
+        wall0 = lastProgress = time.perf_counter()
+        for t, topic, payload, stamp in readRecording(self.path):
+            if self.stop.is_set():
+                break
+            if not np.isnan(t): # unparsable stamps go out with the previous message
+                scale = scales.get(topic)
+                if scale is None:
+                    scale = scales[topic] = self.timeScale(topic)
+                t0, at = origins.setdefault(topic, (t, due))
+                due = max(due, at + (t - t0) * scale)
+            if self.speed > 0:
+                wait = due / self.speed - (time.perf_counter() - wall0)
+                if wait > REPLAY_MIN_WAIT_S and self.stop.wait(wait):
+                    break
+            self.pub.sendTimestamped(topic, payload, str(time.time()) if self.restamp else stamp)
+            self.sent += 1
+            now = time.perf_counter()
+            if progress is not None and now - lastProgress >= REPLAY_PROGRESS_S:
+                progress(self.sent, due)
+                lastProgress = now
+        if progress is not None:
+            progress(self.sent, due)
+        self.log.info(f"Replayed {self.sent} messages from {self.path}")
+        return self.sent
+
+def main():
+    parser = argparse.ArgumentParser(description="Republish a ComsTerm recording over ZMQ")
+    parser.add_argument("path", help="Recording: <name>.csv, <name>.manifest.json, a segment or a .rec directory")
+    parser.add_argument("transport", nargs="?", default="TCP", choices=[t.name for t in Transport],
+                        help="Transport to bind (default TCP)")
+    parser.add_argument("endpoint", nargs="?", default="LOCAL_MSG", choices=[e.name for e in Endpoint],
+                        help="Endpoint to bind (default LOCAL_MSG)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback rate, 1 original timing, N times faster")
+    parser.add_argument("--fast", action="store_true", help="As fast as possible, ignores --speed")
+    parser.add_argument("--topics", default="robotConfig.json", help="Topic map giving each topic's timeScale")
+    parser.add_argument("--restamp", action="store_true", help="Stamp messages with the replay clock")
+    args = parser.parse_args()
+
+    pub = ZmqPub(Transport[args.transport], Endpoint[args.endpoint], hwm=REPLAY_HWM)
+    pub.bind()
+    time.sleep(REPLAY_WARMUP_S)
+    topicMap = TopicMap()
+    if os.path.exists(args.topics):
+        topicMap.load_topics_from_json(args.topics)
+    else:
+        print(f"No topic map at {args.topics}, timestamps taken as seconds")
+    replay = Replay(args.path, pub, speed=0 if args.fast else args.speed, topicMap=topicMap, restamp=args.restamp)
+    try:
+        replay.run(lambda sent, seconds: print(f"\r{sent} messages {seconds:.1f}s", end="", flush=True))
+        print()
+    except KeyboardInterrupt:
+        replay.stop.set()
+    finally:
+        pub.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import numpy as np
+from typing import Optional
+
+"""
+RingBuffer: Fixed capacity NumPy ring.
+        Every sample is written twice, at i and i + capacity, so the newest n
+        samples are always the contiguous slice [head + capacity - n, head + capacity).
+        Reads are views, no copy and no allocation. Costs 2x memory and a second
+        memcpy on write, both cheap next to rebuilding lists every frame.
+        fields > 0 stores that many values per sample field major, e.g. (t, v),
+        so view() is (fields, n) and each field is itself contiguous.
+"""
+
+class RingBuffer():
+    def __init__(self, capacity: int, fields: int = 0, dtype=np.float64):
+        self.fields = fields # 0 for a plain series
+        self.dtype = np.dtype(dtype)
+        self._alloc(max(1, int(capacity)))
+
+    def _alloc(self, capacity: int):
+        self.capacity = capacity
+        shape = (self.fields, 2 * capacity) if self.fields else (2 * capacity,)
+        self._data = np.empty(shape, dtype=self.dtype)
+        self.head = 0 # next write slot in [0, capacity)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _write(self, start: int, stop: int, samples: np.ndarray):
+        self._data[..., start:stop] = samples
+        self._data[..., start + self.capacity:stop + self.capacity] = samples
+
+    def extend(self, samples):
+        """Bulk append of (n,) or, with fields, (n, fields) samples, only the newest capacity are kept."""
+        samples = np.asarray(samples, dtype=self.dtype)
+        samples = samples.reshape(-1, self.fields).T if self.fields else samples.reshape(-1)
+        n = samples.shape[-1]
+        if n == 0:
+            return
+        cap = self.capacity
+        if n >= cap:
+            self._write(0, cap, samples[..., -cap:])
+            self.head = 0
+            self.count = cap
+            return
+        end = self.head + n
+        if end <= cap:
+            self._write(self.head, end, samples)
+        else: # wraps, split at the end of the lower copy
+            k = cap - self.head
+            self._write(self.head, cap, samples[..., :k])
+            self._write(0, n - k, samples[..., k:])
+        self.head = end % cap
+        self.count = min(cap, self.count + n)
+
+    def append(self, sample):
+        self.extend(np.asarray(sample, dtype=self.dtype)[np.newaxis])
+
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """Newest n samples (all when None), oldest first, as a read only view."""
+        n = self.count if n is None else min(n, self.count)
+        end = self.head + self.capacity
+        out = self._data[..., end - n:end]
+        out.flags.writeable = False
+        return out
+
+    def last(self) -> np.ndarray:
+        """Newest sample, (fields,) or a scalar, raises IndexError when empty."""
+        if self.count == 0:
+            raise IndexError("RingBuffer is empty")
+        return self._data[..., self.head + self.capacity - 1]
+
+    def replace(self, samples):
+        self.clear()
+        self.extend(samples)
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def resize(self, capacity: int):
+        """Change capacity keeping the newest samples."""
+        capacity = max(1, int(capacity))
+        if capacity == self.capacity:
+            return
+        kept = self.view(capacity).copy()
+        self._alloc(capacity)
+        self.extend(kept.T if self.fields else kept)
@@ -0,0 +1,277 @@
+import numpy as np
+import time
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Callable, Optional
+from operator import itemgetter
+from functools import partial
+
+from common.logger import getmylogger
+from common.worker import Worker
+from common.zmqutils import ZmqSub, ZmqEventLoop, Transport, Endpoint, DropStats, buildAddress
+from common.messages import Topic
+from common.codec import Payload, isPacked, decodePacked, decodeAscii, decodeText
+from common.latency import LatencyMonitor, LATENCY_ENABLED, parseStamp
+
+"""
+TelemetryHub: Process wide fan-out of device telemetry.
+        One subscription per endpoint, shared by every sink, all endpoints
+        serviced by a single ZmqEventLoop I/O thread.
+        Each multipart frame is decoded once and dispatched by topic name.
+        TCP channels also connect to HUB_REPLAY_ENDPOINT, a local replay reaches
+        every sink without the device on the network.
+"""
+
+HUB_POLL_TIMEOUT_MS = 50 # bounds I/O thread shutdown and (un)subscribe latency
+HUB_ZERO_COPY = False # zmq.Frame receive only beats copying for payloads past ~16kB
+HUB_RCVHWM = 10000 # shared socket, drained by the I/O thread, per sink bounds apply downstream
+SINK_HWM = 1000 # default samples a sink may hold undrained before the oldest are dropped
+HUB_REPLAY_ENDPOINT = Endpoint.LOCAL_MSG # TCP channels also connect here, where ReplayApp publishes by default
+
+@dataclass
+class TelemFrame():
+    topic: Topic = field(default_factory=Topic)
+    values: list[str] | np.ndarray = field(default_factory=list) # str fields (ASCII) or float64 vector (packed), timestamp excluded
+    timestamp: str = ""
+    payload: bytes | memoryview = b"" # undecoded payload, memoryview when the channel is zero copy
+    recvTime: float = 0.0 # perf_counter when the batch was received
+    decodeTime: float = 0.0 # perf_counter after decoding
+
+@dataclass
+class TelemBlock():
+    topic: str = ""
+    names: tuple[str, ...] = field(default_factory=tuple) # one data series per column
+    data: np.ndarray = field(default_factory=lambda: np.empty((0, 0))) # rows = samples, float64 for deep topics, str otherwise
+    timestamps: np.ndarray = field(default_factory=lambda: np.empty(0)) # one per row, NaN when unparsable
+    decodeTimes: np.ndarray = field(default_factory=lambda: np.empty(0)) # perf_counter per row, see common.latency
+
+TelemSink = Callable[[TelemFrame], None] # called from the hub IO thread
+
+class DecodePlan():
+    """
+    Per topic decode plan compiled once from a sink's subscriptions.
+    Hot path is one indexed gather of the split payload into preallocated slots,
+    drained as a TelemBlock. Not thread safe, callers serialise gather/drain.
+    Slots are a ring of capacity samples, a slow drain evicts the oldest rather
+    than queueing. conflate keeps only the newest sample.
+    """
+    def __init__(self, topic: Topic, subscriptions: tuple[str, ...], capacity: int = SINK_HWM, conflate: bool = False):
+        self.topic = topic
+        if topic.nArgs > 2: # HACK makes data-points shallow vs deep
+            fields = [(f"{topic.name}/{argname}", i) for i, argname in enumerate(topic.args[:-1])] # HACK omit timestamp from arg names
+            fields = [(series, i) for series, i in fields if series in subscriptions]
+        else:
+            fields = [(topic.name, 0)]
+        self.names = tuple(series for series, _ in fields)
+        self.columns = np.array([i for _, i in fields], dtype=np.intp)
+        self.numeric = topic.nArgs > 2
+        columns = self.columns.tolist()
+        if len(columns) > 1:
+            self._getter = itemgetter(*columns)
+        elif columns:
+            self._getter = lambda values, i=columns[0]: (values[i],)
+        else: # no subscribed field of this topic, e.g. a misspelled arg
+            self._getter = lambda values: ()
+        self._dtype = np.float64 if self.numeric else object
+        self.conflate = conflate
+        self.capacity = 1 if conflate else max(1, capacity)
+        self.rows = np.empty((self.capacity, len(self.names)), dtype=self._dtype)
+        self.timestamps = np.empty(self.capacity, dtype=np.float64)
+        self.decodeTimes = np.empty(self.capacity, dtype=np.float64)
+        self.start = 0 # oldest undrained slot
+        self.count = 0
+        self.stats = DropStats()
+
+    def gather(self, values: list[str] | np.ndarray) -> tuple:
+        return self._getter(values)
+
+    def append(self, frame: TelemFrame) -> bool:
+        self.stats.received += 1
+        if self.count == self.capacity: # full, evict the oldest sample
+            self.start = (self.start + 1) % self.capacity
+            self.count -= 1
+            if self.conflate:
+                self.stats.conflated += 1
+            else:
+                self.stats.dropped += 1
+        slot = (self.start + self.count) % self.capacity
+        try:
+            if isinstance(frame.values, np.ndarray): # packed payload, already float64
+                self.rows[slot] = frame.values[self.columns]
+            else:
+                self.rows[slot] = self._getter(frame.values) # str -> float64 conversion in C
+        except ValueError:
+            return False
+        try:
+            self.timestamps[slot] = float(frame.timestamp)
+        except ValueError:
+            self.timestamps[slot] = np.nan
+        self.decodeTimes[slot] = frame.decodeTime
+        self.count += 1
+        return True
+
+    def drain(self) -> Optional[TelemBlock]:
+        if self.count == 0:
+            return None
+        if self.start + self.count <= self.capacity:
+            order = slice(self.start, self.start + self.count)
+        else: # wrapped, fancy indexing copies in order
+            order = (self.start + np.arange(self.count)) % self.capacity
+        data = self.rows[order]
+        data = data.copy() if self.numeric else data.astype(str)
+        block = TelemBlock(topic=self.topic.name, names=self.names, data=data,
+                           timestamps=self.timestamps[order].copy(), decodeTimes=self.decodeTimes[order].copy())
+        self.start = 0
+        self.count = 0
+        return block
+
+def decodeFrame(topic: Topic, payload: Payload, timestamp: str) -> Optional[TelemFrame]:
+    try:
+        if isPacked(payload):
+            values = decodePacked(topic, payload)
+        elif topic.nArgs > 2: # HACK makes data-points shallow vs deep
+            values = decodeAscii(topic, payload)
+            if len(values) != topic.nArgs - 1: # timestamp arrives in its own frame
+                return None
+        else:
+            values = [decodeText(payload)]
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return TelemFrame(topic=topic, values=values, timestamp=timestamp, payload=payload)
+
+class HubChannel():
+    """Owns the single ZmqSub for one endpoint and fans decoded frames out to sinks."""
+    def __init__(self, transport: Transport, endpoint: Endpoint, loop: ZmqEventLoop, zeroCopy: bool = HUB_ZERO_COPY):
+        self.log = getmylogger(__name__)
+        self.transport = transport
+        self.endpoint = endpoint
+        self.loop = loop
+        self.subscriber = ZmqSub(transport=transport, endpoint=endpoint, hwm=HUB_RCVHWM)
+        self.topics: dict[str, Topic] = dict()
+        self.sinks: dict[str, tuple[TelemSink, ...]] = dict() # replaced, never mutated, IO thread reads lock free
+        self.latency = LatencyMonitor.instance()
+        self.loop.callSoon(self.subscriber.connect)
+        if transport == Transport.TCP and endpoint != HUB_REPLAY_ENDPOINT: # replays reach sinks with the device offline
+            self.loop.callSoon(partial(self.subscriber.socket.connect, buildAddress(transport, HUB_REPLAY_ENDPOINT)))
+        self.loop.register(self.subscriber, self._onBatch, copy=not zeroCopy)
+
+    def addSink(self, topic: Topic, sink: TelemSink):
+        sinks = self.sinks.get(topic.name, tuple())
+        if sink in sinks:
+            return
+        if topic.name not in self.topics:
+            self.topics[topic.name] = topic
+            self.loop.callSoon(partial(self.subscriber.addTopicSub, topic.name))
+        self.sinks = {**self.sinks, topic.name: sinks + (sink,)}
+
+    def removeSink(self, sink: TelemSink):
+        sinks = dict()
+        for topicname, topicSinks in self.sinks.items():
+            remaining = tuple(s for s in topicSinks if s != sink)
+            if remaining:
+                sinks[topicname] = remaining
+            else:
+                self.topics.pop(topicname, None)
+                self.loop.callSoon(partial(self.subscriber.removeTopicSub, topicname))
+        self.sinks = sinks
+
+    def isEmpty(self) -> bool:
+        return len(self.sinks) == 0
+
+    def close(self):
+        self.loop.unregister(self.subscriber)
+        self.loop.callSoon(self.subscriber.close)
+        self.log.info(f"Closing TelemetryHub channel {self.endpoint.name}")
+
+    def _onBatch(self, batch: list[tuple[str, Payload, str]]):
+        # Runs on the hub I/O thread
+        recvTime = time.perf_counter()
+        recvWall = time.time() # comparable with the publisher's timestamp frame
+        decodeTimes = list()
+        stamps = list() # wall clock stamps of the decoded frames, seconds
+        for topicname, payload, timestamp in batch:
+            sinks = self.sinks.get(topicname)
+            topic = self.topics.get(topicname) # removeSink may drop it between the two reads
+            if not sinks or topic is None: # topic no longer wanted
+                continue
+            frame = decodeFrame(topic, payload, timestamp)
+            if frame is None:
+                continue
+            frame.recvTime = recvTime
+            frame.decodeTime = time.perf_counter()
+            decodeTimes.append(frame.decodeTime)
+            if frame.topic.wallClock:
+                stamps.append(parseStamp(timestamp, frame.topic.timeScale))
+            for sink in sinks:
+                try:
+                    sink(frame)
+                except Exception as e:
+                    self.log.error(f"Exception in TelemetryHub sink {e}")
+        if LATENCY_ENABLED and decodeTimes:
+            if stamps:
+                self.latency.recordNetwork(recvWall, np.array(stamps))
+            self.latency.record("decode", np.array(decodeTimes) - recvTime)
+
+class TelemetryHub():
+    """
+    Process wide registry of endpoint channels, use TelemetryHub.instance().
+    Every channel is serviced by one shared ZmqEventLoop I/O thread.
+    """
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self):
+        self.log = getmylogger(__name__)
+        self.lock = threading.Lock()
+        self.channels: dict[tuple[Transport, Endpoint], HubChannel] = dict()
+        self.loop = None
+        self.workerIO = None
+        self.zeroCopy: dict[tuple[Transport, Endpoint], bool] = dict() # per endpoint receive mode override
+
+    @classmethod
+    def instance(cls) -> "TelemetryHub":
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _startLoop(self):
+        self.loop = ZmqEventLoop(timeout=HUB_POLL_TIMEOUT_MS)
+        self.workerIO = Worker(self.loop.run)
+        self.workerIO._begin()
+
+    def channelStats(self, transport: Transport, endpoint: Endpoint) -> Optional[DropStats]:
+        """Counters of the shared socket for an endpoint, None when no channel is open."""
+        with self.lock:
+            channel = self.channels.get((transport, endpoint))
+            return replace(channel.subscriber.stats) if channel is not None else None
+
+    def setZeroCopy(self, transport: Transport, endpoint: Endpoint, zeroCopy: bool = True):
+        """Receive mode for an endpoint, applies when its channel is (re)created."""
+        with self.lock:
+            self.zeroCopy[(transport, endpoint)] = zeroCopy
+
+    def register(self, topic: Topic, sink: TelemSink, transport: Transport, endpoint: Endpoint):
+        with self.lock:
+            if self.workerIO is None:
+                self._startLoop()
+            channel = self.channels.get((transport, endpoint))
+            if channel is None:
+                channel = HubChannel(transport=transport, endpoint=endpoint, loop=self.loop,
+                                     zeroCopy=self.zeroCopy.get((transport, endpoint), HUB_ZERO_COPY))
+                self.channels[(transport, endpoint)] = channel
+            channel.addSink(topic, sink)
+
+    def unregister(self, sink: TelemSink, transport: Transport, endpoint: Endpoint):
+        with self.lock:
+            channel = self.channels.get((transport, endpoint))
+            if channel is None:
+                return
+            channel.removeSink(sink)
+            if channel.isEmpty(): # last sink gone, release the socket
+                channel.close()
+                del self.channels[(transport, endpoint)]
+            if not self.channels and self.loop is not None: # nothing left to service, stop the I/O thread
+                self.loop.stop()
+                self.workerIO = None
+                self.loop = None
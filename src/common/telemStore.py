@@ -0,0 +1,253 @@
+import threading
+import numpy as np
+from typing import Iterable, Optional
+
+from common.logger import getmylogger
+from common.zmqutils import Transport, Endpoint, DropStats
+from common.messages import TopicMap, Topic
+from common.telemHub import TelemetryHub, TelemFrame
+from common.ringBuffer import RingBuffer
+from common.pyramid import HistoryPyramid
+
+"""
+TelemetryStore: Process wide columnar history of subscribed telemetry.
+        One bounded set of timestamped columns per topic, fed once by the
+        TelemetryHub however many plots, maps or tools read it.
+        Queries by series name return (t, v) views, no copy:
+            last(series, n)              -- newest n samples
+            lastAligned(series, n)       -- newest n of several fields of one topic, one view
+            recent(series, seconds, end) -- the seconds up to end (default newest)
+            between(series, t0, t1)      -- t0 <= t <= t1
+            overview(series, t0, t1)     -- min / max / mean over t0..t1 from the finest
+                                            HistoryPyramid tier reaching back to t0, for
+                                            windows longer than the raw history
+        Written on the hub I/O thread, read from anywhere. A view of n samples stays
+        intact for capacity - n further appends, copy() to hold one longer. Readers
+        reserve() the n they view, STORE_VIEW_HEADROOM times over.
+"""
+
+STORE_CAPACITY = 50000 # samples per topic, TELEM/TWSB (25 fields) costs ~20MB at this depth
+STORE_PYRAMIDS = True # downsampled history beyond STORE_CAPACITY, ~15MB more for TELEM/TWSB
+STORE_VIEW_HEADROOM = 2 # capacity per reserved sample, a view of the reserved n outlives n appends
+
+def seriesNames(topic: Topic) -> tuple[str, ...]:
+    if topic.nArgs > 2: # HACK makes data-points shallow vs deep
+        return tuple(f"{topic.name}/{argname}" for argname in topic.args[:-1]) # HACK omit timestamp from arg names
+    return (topic.name,)
+
+class TopicColumns():
+    """
+    Timestamped columns of one topic, row 0 is time and row i + 1 is names[i].
+    Field major so each column of a view is contiguous. Times never decrease, an
+    unparsable stamp repeats the previous one and a clock that jumps back (publisher
+    reboot) clears the history.
+    """
+    def __init__(self, topic: Topic, capacity: int = STORE_CAPACITY, pyramid: bool = STORE_PYRAMIDS):
+        self.topic = topic
+        self.names = seriesNames(topic)
+        self.index = {name: i + 1 for i, name in enumerate(self.names)}
+        self.ring = RingBuffer(capacity, fields=len(self.names) + 1)
+        self.pyramid = HistoryPyramid(len(self.names)) if pyramid else None
+        self.row = np.empty(len(self.names) + 1, dtype=np.float64)
+        self.lastTime = np.nan
+        self.version = 0 # bumped on every append, cheap change detection for readers
+        self.stats = DropStats()
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ring)
+
+    @property
+    def capacity(self) -> int:
+        return self.ring.capacity
+
+    def reserve(self, capacity: int):
+        """Grow so a view of capacity samples stays intact while the writer appends, never shrinks."""
+        with self.lock:
+            if capacity * STORE_VIEW_HEADROOM > self.ring.capacity:
+                self.ring.resize(capacity * STORE_VIEW_HEADROOM)
+
+    def append(self, timestamp: str | float, values: list[str] | np.ndarray) -> bool:
+        with self.lock:
+            self.stats.received += 1
+            try:
+                self.row[1:] = values # str -> float64 conversion in C
+            except ValueError: # malformed or text payload
+                self.stats.dropped += 1
+                return False
+            try:
+                t = float(timestamp)
+            except ValueError:
+                t = np.nan
+            if np.isnan(t):
+                t = self.lastTime
+                if np.isnan(t): # nothing to inherit yet
+                    self.stats.dropped += 1
+                    return False
+            if t < self.lastTime:
+                self.ring.clear()
+                if self.pyramid is not None:
+                    self.pyramid.clear()
+            self.row[0] = t
+            self.ring.append(self.row)
+            if self.pyramid is not None:
+                self.pyramid.add(t, self.row[1:])
+            self.lastTime = t
+            self.version += 1
+            return True
+
+    def clear(self):
+        with self.lock:
+            self.ring.clear()
+            if self.pyramid is not None:
+                self.pyramid.clear()
+            self.lastTime = np.nan
+            self.version += 1
+
+    def view(self, n: Optional[int] = None) -> np.ndarray:
+        """Newest n rows of every column, (1 + len(names), n)."""
+        with self.lock:
+            return self.ring.view(n)
+
+    def span(self, t0: float, t1: float) -> np.ndarray:
+        """Every column for t0 <= t <= t1, O(log n) search."""
+        data = self.view()
+        i0, i1 = np.searchsorted(data[0], t0, side="left"), np.searchsorted(data[0], t1, side="right")
+        return data[:, i0:i1]
+
+    def overview(self, row: int, t0: float, t1: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (t, min, max, mean) of one column over t0..t1. Raw samples when they reach back
+        to t0, all four are then the same view. Otherwise tier buckets, stitched to the
+        raw samples newer than the last closed bucket.
+        """
+        with self.lock:
+            raw = self.ring.view()
+            tier = None
+            if self.pyramid is not None and len(raw[0]) and raw[0][0] > t0:
+                tier = self.pyramid.covering(t0)
+            if tier is None:
+                i0, i1 = np.searchsorted(raw[0], t0, side="left"), np.searchsorted(raw[0], t1, side="right")
+                column = raw[row][i0:i1]
+                return raw[0][i0:i1], column, column, column
+            buckets = tier.ring.view()
+            b0, b1 = np.searchsorted(buckets[0], t0, side="left"), np.searchsorted(buckets[0], t1, side="right")
+            r0, r1 = np.searchsorted(raw[0], tier.end, side="right"), np.searchsorted(raw[0], t1, side="right")
+            tail = raw[:, r0:r1]
+            return tuple(np.concatenate((buckets[i][b0:b1], tail[j])) # copies, O(buckets + tail)
+                         for i, j in zip((0, *tier.columns(row - 1)), (0, row, row, row)))
+
+class TelemetryStore():
+    """Process wide topic columns fed by the TelemetryHub, use TelemetryStore.instance()."""
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self, capacity: int = STORE_CAPACITY):
+        self.log = getmylogger(__name__)
+        self.lock = threading.Lock()
+        self.capacity = capacity
+        self.hub = TelemetryHub.instance()
+        self.topics: dict[str, TopicColumns] = dict()
+        self.series: dict[str, tuple[TopicColumns, int]] = dict() # series name -> (columns, row)
+        self.users: dict[tuple[Transport, Endpoint], int] = dict() # subscribe() calls not yet released
+
+    @classmethod
+    def instance(cls) -> "TelemetryStore":
+        with cls._instanceLock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def _columns(self, topic: Topic, capacity: int) -> TopicColumns:
+        columns = self.topics.get(topic.name)
+        if columns is None:
+            columns = TopicColumns(topic, max(capacity * STORE_VIEW_HEADROOM, self.capacity))
+            self.topics[topic.name] = columns
+            for name, row in columns.index.items():
+                self.series[name] = (columns, row)
+        else:
+            columns.reserve(capacity)
+        return columns
+
+    def subscribe(self, topicMap: TopicMap, series: Iterable[str], transport: Transport, endpoint: Endpoint,
+                  capacity: int = 0):
+        """Start storing the topics behind series, keeping at least capacity samples each. Pair with release()."""
+        with self.lock:
+            for name in series:
+                topic = topicMap.get_topic_by_series(name)
+                if not isinstance(topic, Topic):
+                    self.log.error(f"Unknown topic {name}")
+                    continue
+                self._columns(topic, capacity)
+                self.hub.register(topic, self._onFrame, transport, endpoint)
+            self.users[(transport, endpoint)] = self.users.get((transport, endpoint), 0) + 1
+
+    def release(self, transport: Transport, endpoint: Endpoint):
+        """Drop one subscribe() on an endpoint, the hub sink goes with the last one. History is kept."""
+        with self.lock:
+            users = self.users.get((transport, endpoint), 0) - 1
+            if users > 0:
+                self.users[(transport, endpoint)] = users
+                return
+            self.users.pop((transport, endpoint), None)
+            self.hub.unregister(self._onFrame, transport, endpoint)
+
+    def _onFrame(self, frame: TelemFrame):
+        # Runs on the hub I/O thread
+        columns = self.topics.get(frame.topic.name)
+        if columns is not None:
+            columns.append(frame.timestamp, frame.values)
+
+    def append(self, topic: Topic, timestamp: str | float, values: list[str] | np.ndarray) -> bool:
+        """Store a sample directly, e.g. from a replay or a test fixture."""
+        with self.lock:
+            columns = self._columns(topic, 0)
+        return columns.append(timestamp, values)
+
+    def columns(self, topicName: str) -> Optional[TopicColumns]:
+        return self.topics.get(topicName)
+
+    def has(self, series: str) -> bool:
+        return series in self.series
+
+    def lastTime(self, series: str) -> float:
+        """Newest time of the series' topic, NaN when nothing is stored."""
+        entry = self.series.get(series)
+        return entry[0].lastTime if entry is not None else np.nan
+
+    def last(self, series: str, n: Optional[int] = None) -> tuple[np.ndarray, np.ndarray]:
+        entry = self.series.get(series)
+        if entry is None:
+            return np.empty(0), np.empty(0)
+        columns, row = entry
+        data = columns.view(n)
+        return data[0], data[row]
+
+    def lastAligned(self, series: tuple[str, ...], n: Optional[int] = None) -> Optional[tuple[np.ndarray, ...]]:
+        """(t, *values) of series of one topic from a single view so rows align, None when they span topics."""
+        entries = [self.series.get(name) for name in series]
+        if any(entry is None for entry in entries) or len({id(columns) for columns, _ in entries}) > 1:
+            return None
+        data = entries[0][0].view(n)
+        return (data[0], *(data[row] for _, row in entries))
+
+    def between(self, series: str, t0: float, t1: float) -> tuple[np.ndarray, np.ndarray]:
+        entry = self.series.get(series)
+        if entry is None:
+            return np.empty(0), np.empty(0)
+        columns, row = entry
+        data = columns.span(t0, t1)
+        return data[0], data[row]
+
+    def overview(self, series: str, t0: float, t1: float) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(t, min, max, mean) over t0..t1, see TopicColumns.overview."""
+        entry = self.series.get(series)
+        if entry is None:
+            empty = np.empty(0)
+            return empty, empty, empty, empty
+        columns, row = entry
+        return columns.overview(row, t0, t1)
+
+    def recent(self, series: str, seconds: float, end: Optional[float] = None) -> tuple[np.ndarray, np.ndarray]:
+        end = self.lastTime(series) if end is None else end
+        return self.between(series, end - seconds, end)
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+import concurrent.futures
+from typing import AsyncIterator, Coroutine, Optional
+
+import zmq
+import zmq.asyncio
+
+from common.logger import getmylogger
+from common.worker import Worker
+from common.messages import Topic
+from common.codec import encodePacked
+from common.zmqutils import Transport, Endpoint, buildAddress
+
+"""
+zmqasync: asyncio counterparts of ZmqPub / ZmqSub.
+        Sockets shadow the process wide zmq.Context so inproc endpoints are
+        shared with the blocking classes. All coroutines of a process run on
+        one AsyncLoopThread, use AsyncLoopThread.instance().submit(coro).
+"""
+
+def asyncContext() -> zmq.asyncio.Context:
+    return zmq.asyncio.Context.shadow(zmq.Context.instance())
+
+class AsyncZmqPub():
+    def __init__(self, transport: Transport, endpoint: Endpoint):
+        self.log = getmylogger(__name__)
+        self.socketAddress = buildAddress(transport, endpoint)
+        self.context = asyncContext()
+        self.socket = self.context.socket(zmq.PUB)
+
+    def bind(self):
+        self.socket.bind(self.socketAddress)
+
+    def connect(self):
+        self.socket.connect(self.socketAddress)
+
+    async def send(self, topic: str, data: str):
+        await self.socket.send_multipart([topic.encode(), data.encode()])
+
+    async def sendTimestamped(self, topic: str, data: str, timestamp: str):
+        await self.socket.send_multipart([topic.encode(), data.encode(), timestamp.encode()])
+
+    async def sendPacked(self, topic: Topic, values, timestamp: str):
+        await self.socket.send_multipart([topic.name.encode(), encodePacked(topic, values), timestamp.encode()])
+
+    def close(self):
+        self.socket.close()
+
+class AsyncZmqSub():
+    def __init__(self, transport: Transport, endpoint: Endpoint):
+        self.log = getmylogger(__name__)
+        self.socketAddress = buildAddress(transport, endpoint)
+        self.context = asyncContext()
+        self.socket = self.context.socket(zmq.SUB)
+
+    def connect(self):
+        self.socket.connect(self.socketAddress)
+
+    def addTopicSub(self, topic: str):
+        self.socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
+
+    def removeTopicSub(self, topic: str):
+        self.socket.setsockopt(zmq.UNSUBSCRIBE, topic.encode())
+
+    async def receiveRaw(self, timeout: Optional[int] = None) -> tuple[str, bytes, str]:
+        """Waits up to timeout ms (None waits forever), empty frames on timeout."""
+        try:
+            if timeout is not None and not await self.socket.poll(timeout, zmq.POLLIN):
+                return "", b"", ""
+            topic, message, timestamp = await self.socket.recv_multipart()
+            return topic.decode(), message, timestamp.decode()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.log.error(f"Error receiving message: {e}")
+            return "", b"", ""
+
+    async def receive(self, timeout: Optional[int] = None) -> tuple[str, str, str]:
+        topic, message, timestamp = await self.receiveRaw(timeout)
+        return topic, message.decode(), timestamp
+
+    async def receive_batch(self, limit: int = 256, timeout: Optional[int] = 0) -> list[tuple[str, bytes, str]]:
+        """Await the first message for up to timeout ms then drain what is queued, raw payloads."""
+        batch = list()
+        if not await self.socket.poll(timeout, zmq.POLLIN):
+            return batch
+        while len(batch) < limit:
+            try:
+                topic, message, timestamp = await self.socket.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+            except ValueError: # not a 3 frame message
+                continue
+            batch.append((topic.decode(), message, timestamp.decode()))
+        return batch
+
+    async def __aiter__(self) -> AsyncIterator[tuple[str, bytes, str]]:
+        while True:
+            for frames in await self.receive_batch(timeout=None):
+                yield frames
+
+    def close(self):
+        self.socket.close()
+
+class AsyncLoopThread():
+    """
+    One asyncio event loop on a daemon Worker thread, running alongside the Qt loop.
+    Any thread may submit coroutines, results come back as concurrent Futures.
+    """
+    _instance = None
+    _instanceLock = threading.Lock()
+
+    def __init__(self):
+        self.log = getmylogger(__name__)
+        self.loop = asyncio.new_event_loop()
+        self.workerIO = Worker(self._run)
+        self.workerIO._begin()
+
+    @classmethod
+    def instance(cls) -> "AsyncLoopThread":
+        with cls._instanceLock:
+            if cls._instance is None or cls._instance.loop.is_closed():
+                cls._instance = cls()
+            return cls._instance
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        pending = asyncio.all_tasks(self.loop)
+        for task in pending:
+            task.cancel()
+        self.loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        self.loop.close()
+        self.log.info("Exiting AsyncLoopThread")
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def callSoon(self, func, *args):
+        self.loop.call_soon_threadsafe(func, *args)
+
+    def stop(self):
+        self.workerIO._stop()
+        self.loop.call_soon_threadsafe(self.loop.stop)
@@ -0,0 +1,164 @@
+import os
+import time
+import threading
+import numpy as np
+import zmq
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from common.logger import getmylogger
+from common.messages import TopicMap, Topic
+from common.codec import encodeAscii, encodePacked, topicDtype
+from common.telemHub import decodeFrame
+from common.zmqutils import ZmqPub, ZmqSub, Transport, Endpoint
+
+"""
+zmqbench: Loopback throughput / latency benchmark of the telemetry path.
+        A publisher thread encodes TELEM/TWSB samples and stamps the timestamp
+        frame with perf_counter_ns, the caller's thread receives and runs
+        decodeFrame. Latency therefore covers encode, transport and decode.
+        Both ends share one interpreter, flat out runs include GIL contention,
+        pass a rate to measure latency below saturation.
+"""
+
+log = getmylogger(__name__)
+
+BENCH_TOPIC = "TELEM/TWSB"
+BENCH_CONFIG = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../robotConfig.json'))
+BENCH_ENDPOINTS = {
+    Transport.INPROC: Endpoint.BENCH,
+    Transport.IPC: Endpoint.BENCH,
+    Transport.TCP: Endpoint.LOCAL_BENCH,
+}
+BENCH_IDLE_TIMEOUT_MS = 1000 # receiver gives up once the stream stalls this long
+BENCH_SAMPLE_ROWS = 1024 # distinct sample rows cycled through by the publisher
+
+@dataclass
+class BenchResult():
+    transport: str = ""
+    encoding: str = ""
+    sent: int = 0
+    received: int = 0
+    payloadBytes: int = 0 # per message, topic and timestamp frames excluded
+    seconds: float = 0.0
+    msgsPerSec: float = 0.0
+    mbPerSec: float = 0.0 # all three frames
+    latencyUs: dict[str, float] = field(default_factory=dict) # p50 / p99 / p999 / max
+    error: str = ""
+
+def benchEncoders(topic: Topic) -> dict[str, Callable[[list[float]], bytes]]:
+    encoders = {"ascii": lambda values: encodeAscii(topic, values)}
+    if topicDtype(topic) is not None:
+        encoders["packed"] = lambda values: encodePacked(topic, values)
+    return encoders
+
+def sampleRows(topic: Topic, nRows: int = BENCH_SAMPLE_ROWS) -> list[list[float]]:
+    rng = np.random.default_rng(0)
+    rows = np.round(rng.uniform(-1000, 1000, (nRows, topic.nArgs - 1)), 3) # %0.3f like the device
+    return rows.tolist()
+
+def _publish(pub: ZmqPub, topic: Topic, encode: Callable, rows: list, count: int, rate: float):
+    topicname = topic.name.encode()
+    period = int(1e9 / rate) if rate > 0 else 0
+    nextSend = time.perf_counter_ns()
+    for i in range(count):
+        if period:
+            while time.perf_counter_ns() < nextSend:
+                time.sleep(0) # yield the GIL to the receiver
+            nextSend += period
+        payload = encode(rows[i % len(rows)])
+        pub.socket.send_multipart([topicname, payload, str(time.perf_counter_ns()).encode()])
+
+def _waitForSubscriber(pub: ZmqPub, sub: ZmqSub, topic: Topic, payload: bytes):
+    # PUB drops everything until the subscription has propagated (slow joiner)
+    deadline = time.monotonic() + 5
+    while not sub.receive_batch(timeout=10, raw=True):
+        if time.monotonic() > deadline:
+            raise TimeoutError("Subscriber never connected")
+        pub.socket.send_multipart([topic.name.encode(), payload, b"0"])
+    time.sleep(0.01)
+    while sub.receive_batch(timeout=10, raw=True): # drain the warm up messages
+        pass
+
+def benchOnce(topic: Topic, transport: Transport, encoding: str, count: int, rate: float = 0) -> BenchResult:
+    result = BenchResult(transport=transport.name, encoding=encoding, sent=count)
+    encode = benchEncoders(topic)[encoding]
+    rows = sampleRows(topic)
+    result.payloadBytes = len(encode(rows[0]))
+    endpoint = BENCH_ENDPOINTS[transport]
+    pub = ZmqPub(transport, endpoint, hwm=0) # unbounded, losses would skew the percentiles
+    sub = ZmqSub(transport, endpoint, hwm=0)
+    pub.socket.setsockopt(zmq.LINGER, 0)
+    try:
+        pub.bind()
+        sub.addTopicSub(topic.name)
+        sub.connect()
+        _waitForSubscriber(pub, sub, topic, encode(rows[0]))
+
+        latencies = np.empty(count, dtype=np.int64)
+        nbytes = 0
+        received = 0
+        sender = threading.Thread(target=_publish, args=(pub, topic, encode, rows, count, rate), daemon=True)
+        tStart = time.perf_counter_ns()
+        sender.start()
+        while received < count:
+            batch = sub.receive_batch(limit=256, timeout=BENCH_IDLE_TIMEOUT_MS, raw=True)
+            if not batch:
+                break
+            for topicname, payload, timestamp in batch:
+                if decodeFrame(topic, payload, timestamp) is None:
+                    continue
+                latencies[received] = time.perf_counter_ns() - int(timestamp)
+                nbytes += len(topicname) + len(payload) + len(timestamp)
+                received += 1
+        tEnd = time.perf_counter_ns()
+        sender.join()
+    except Exception as e:
+        result.error = str(e)
+        return result
+    finally:
+        sub.close()
+        pub.close()
+
+    result.received = received
+    result.seconds = (tEnd - tStart) / 1e9
+    if received:
+        result.msgsPerSec = received / result.seconds
+        result.mbPerSec = nbytes / result.seconds / 1e6
+        p50, p99, p999 = np.percentile(latencies[:received], (50, 99, 99.9)) / 1e3
+        result.latencyUs = {"p50": round(p50, 1), "p99": round(p99, 1), "p999": round(p999, 1),
+                            "max": round(latencies[:received].max() / 1e3, 1)}
+    return result
+
+def runBench(transports: Optional[list[Transport]] = None, encodings: Optional[list[str]] = None,
+             count: int = 20000, rate: float = 0, configFile: str = BENCH_CONFIG) -> list[BenchResult]:
+    topicMap = TopicMap()
+    topicMap.load_topics_from_json(configFile)
+    topic = topicMap.get_topic_by_name(BENCH_TOPIC)
+    if not isinstance(topic, Topic):
+        raise ValueError(f"{BENCH_TOPIC} not found in {configFile}")
+    transports = transports or list(BENCH_ENDPOINTS.keys())
+    encoders = benchEncoders(topic)
+    encodings = encodings or list(encoders.keys())
+    unsupported = [encoding for encoding in encodings if encoding not in encoders]
+    if unsupported:
+        raise ValueError(f"{BENCH_TOPIC} cannot be encoded as {', '.join(unsupported)}")
+    results = list()
+    for transport in transports:
+        for encoding in encodings:
+            log.info(f"Benchmarking {transport.name} {encoding}, {count} messages")
+            results.append(benchOnce(topic, transport, encoding, count, rate))
+    return results
+
+def formatResults(results: list[BenchResult]) -> str:
+    lines = [f"{'transport':<10}{'encoding':<10}{'recv/sent':>14}{'bytes':>7}{'msgs/s':>11}{'MB/s':>8}"
+             f"{'p50 us':>10}{'p99 us':>10}{'p999 us':>10}"]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.transport:<10}{r.encoding:<10}  error: {r.error}")
+            continue
+        lat = r.latencyUs
+        lines.append(f"{r.transport:<10}{r.encoding:<10}{f'{r.received}/{r.sent}':>14}{r.payloadBytes:>7}"
+                     f"{r.msgsPerSec:>11.0f}{r.mbPerSec:>8.2f}"
+                     f"{lat.get('p50', 0):>10.1f}{lat.get('p99', 0):>10.1f}{lat.get('p999', 0):>10.1f}")
+    return "\n".join(lines)
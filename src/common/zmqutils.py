@@ -1,10 +1,18 @@
 import zmq
+import json
 import argparse
 import sys, os
+import queue
+import threading
 from enum import Enum
+from dataclasses import dataclass, asdict
+from functools import partial
+from typing import Callable, Optional
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
 from common.logger import getmylogger
+from common.messages import Topic
+from common.codec import encodePacked
 
 class Transport(Enum):
     TCP = "tcp://"
@@ -25,17 +33,29 @@ class Endpoint(Enum):
     DBOT_CMD = "dbot.local:5556"
     LOCAL_MSG = "localhost:5555"
     LOCAL_CMD = "localhost:5556"
+    BENCH = "comsterm_bench" # INPROC / IPC benchmark
+    LOCAL_BENCH = "127.0.0.1:5599" # TCP benchmark
+    STATS = "comsterm_stats" # internal diagnostics, see common.latency
     SIG = "siggen"
 
 def buildAddress(transport: Transport, endpoint: Endpoint) -> str:
     return f"{transport.value}{endpoint.value}"
 
+ZMQ_DEFAULT_HWM = 1000 # libzmq default, messages queued per peer before new ones are dropped
+
+@dataclass
+class DropStats():
+    received: int = 0
+    dropped: int = 0 # evicted past a high water mark
+    conflated: int = 0 # superseded by a newer message on the same topic
+
 class ZmqPub():
-    def __init__(self, transport: Transport, endpoint: Endpoint):
+    def __init__(self, transport: Transport, endpoint: Endpoint, hwm: int = ZMQ_DEFAULT_HWM):
         self.log = getmylogger(__name__)
         self.socketAddress = buildAddress(transport, endpoint)
         self.context = zmq.Context.instance()
         self.socket = self.context.socket(zmq.PUB)
+        self.socket.setsockopt(zmq.SNDHWM, hwm) # 0 is unbounded
 
     def bind(self):
         self.socket.bind(self.socketAddress)
@@ -49,15 +69,30 @@ class ZmqPub():
     def sendTimestamped(self, topic: str, data: str, timestamp: str):
         self.socket.send_multipart([topic.encode(), data.encode(), timestamp.encode()])
 
+    def sendPacked(self, topic: Topic, values, timestamp: str):
+        # Binary payload laid out by topic.format, see common.codec
+        self.socket.send_multipart([topic.name.encode(), encodePacked(topic, values), timestamp.encode()])
+
     def close(self):
         self.socket.close()
 
 class ZmqSub():
-    def __init__(self, transport: Transport, endpoint: Endpoint):
+    """
+    hwm: RCVHWM, libzmq drops new messages once this many are queued. Drops inside
+         libzmq are not reported back, stats only counts what this class discards.
+    conflate: receive_batch keeps only the newest message per topic. ZMQ_CONFLATE
+         does not support multipart messages so this is done after the read.
+    """
+    def __init__(self, transport: Transport, endpoint: Endpoint, hwm: int = ZMQ_DEFAULT_HWM, conflate: bool = False):
         self.log = getmylogger(__name__)
         self.socketAddress = buildAddress(transport, endpoint)
         self.context = zmq.Context.instance()
         self.socket = self.context.socket(zmq.SUB)
+        self.socket.setsockopt(zmq.RCVHWM, hwm) # must precede connect()
+        self.conflate = conflate
+        self.stats = DropStats()
+        self.poller = zmq.Poller()
+        self.poller.register(self.socket, zmq.POLLIN)
 
     def connect(self):
         self.socket.connect(self.socketAddress)
@@ -65,31 +100,171 @@ class ZmqSub():
     def addTopicSub(self, topic: str):
         self.socket.setsockopt(zmq.SUBSCRIBE, topic.encode())
 
-    def receive(self) -> tuple[str, str, str]:
+    def removeTopicSub(self, topic: str):
+        self.socket.setsockopt(zmq.UNSUBSCRIBE, topic.encode())
+
+    def poll(self, timeout: Optional[int] = None) -> bool:
+        """Wait up to timeout ms for a message, None waits forever."""
+        return len(self.poller.poll(timeout)) > 0
+
+    def _recvFrames(self, copy: bool = True) -> Optional[list]:
         try:
-            topic, message, timestamp = self.socket.recv_multipart()
-            return topic.decode(), message.decode(), timestamp.decode()
+            frames = self.socket.recv_multipart(zmq.NOBLOCK, copy=copy)
         except zmq.Again:
-            return "", "", ""
+            return None
+        if len(frames) != 3:
+            self.log.error(f"Error receiving message: expected 3 frames got {len(frames)}")
+            return None
+        return frames
+
+    def receive(self, timeout: Optional[int] = None) -> tuple[str, str, str]:
+        """Blocks up to timeout ms (None waits forever), empty strings on timeout."""
+        frames = self.receiveRaw(timeout)
+        try:
+            return frames[0], frames[1].decode(), frames[2]
         except Exception as e:
             self.log.error(f"Error receiving message: {e}")
             return "", "", ""
 
+    def receiveRaw(self, timeout: Optional[int] = None) -> tuple[str, bytes, str]:
+        # Payload left as bytes, may be ASCII or packed
+        try:
+            if not self.poll(timeout):
+                return "", b"", ""
+            frames = self._recvFrames()
+            if frames is None:
+                return "", b"", ""
+            topic, message, timestamp = frames
+            return topic.decode(), message, timestamp.decode()
+        except Exception as e:
+            self.log.error(f"Error receiving message: {e}")
+            return "", b"", ""
+
+    def receive_batch(self, limit: int = 256, timeout: Optional[int] = 0, raw: bool = False, copy: bool = True) -> list[tuple]:
+        """
+        Wait up to timeout ms for the first message, then drain whatever is already
+        queued with NOBLOCK, at most limit messages. Payloads are bytes when raw.
+        copy=False: payloads are memoryviews onto the received zmq.Frame, implies raw.
+        Only pays off for large payloads (~16kB+), below that pyzmq copying is cheaper.
+        """
+        batch = list()
+        try:
+            if not self.poll(timeout):
+                return batch
+            while len(batch) < limit:
+                frames = self._recvFrames(copy)
+                if frames is None:
+                    break
+                topic, message, timestamp = frames
+                if not copy: # only the tiny topic/timestamp frames are copied out
+                    batch.append((topic.bytes.decode(), message.buffer, timestamp.bytes.decode()))
+                    continue
+                batch.append((topic.decode(), message if raw else message.decode(), timestamp.decode()))
+        except Exception as e:
+            self.log.error(f"Error receiving message: {e}")
+        self.stats.received += len(batch)
+        if self.conflate and len(batch) > 1:
+            latest = {frames[0]: frames for frames in batch} # later messages overwrite earlier ones
+            self.stats.conflated += len(batch) - len(latest)
+            batch = list(latest.values())
+        return batch
+
     def close(self):
+        self.poller.unregister(self.socket)
         self.socket.close()
 
+class ZmqEventLoop():
+    """
+    Services several ZmqSubs from one thread with a single zmq.Poller.
+    Handlers receive each drained batch as raw (topic, payload, timestamp) tuples,
+    payload is bytes, or a zero copy memoryview when registered with copy=False.
+    register/unregister/callSoon are thread safe, the work runs on the loop thread.
+    """
+    def __init__(self, timeout: int = 100, batchLimit: int = 256):
+        self.log = getmylogger(__name__)
+        self.timeout = timeout # ms, bounds shutdown and (un)registration latency
+        self.batchLimit = batchLimit
+        self.poller = zmq.Poller()
+        self.handlers: dict[zmq.Socket, tuple[ZmqSub, Callable[[list[tuple]], None], bool]] = dict()
+        self.pending = queue.SimpleQueue() # callables run on the loop thread
+        self.stopEvent = threading.Event()
+
+    def callSoon(self, func: Callable[[], None]):
+        self.pending.put(func)
+
+    def register(self, sub: ZmqSub, handler: Callable[[list[tuple]], None], copy: bool = True):
+        self.callSoon(partial(self._register, sub, handler, copy))
+
+    def unregister(self, sub: ZmqSub):
+        self.callSoon(partial(self._unregister, sub))
+
+    def _register(self, sub: ZmqSub, handler, copy: bool):
+        self.handlers[sub.socket] = (sub, handler, copy)
+        self.poller.register(sub.socket, zmq.POLLIN)
+
+    def _unregister(self, sub: ZmqSub):
+        if self.handlers.pop(sub.socket, None) is not None:
+            self.poller.unregister(sub.socket)
+
+    def _runPending(self):
+        while not self.pending.empty():
+            try:
+                self.pending.get()()
+            except Exception as e:
+                self.log.error(f"Exception in ZmqEventLoop callback {e}")
+
+    def stop(self):
+        self.stopEvent.set()
+
+    def run(self):
+        while not self.stopEvent.is_set():
+            self._runPending()
+            if not self.handlers: # zmq.Poller returns at once when empty
+                self.stopEvent.wait(self.timeout / 1000)
+                continue
+            for socket, _ in self.poller.poll(self.timeout):
+                sub, handler, copy = self.handlers[socket]
+                batch = sub.receive_batch(self.batchLimit, timeout=0, raw=True, copy=copy)
+                try:
+                    handler(batch)
+                except Exception as e:
+                    self.log.error(f"Exception in ZmqEventLoop handler {e}")
+        self._runPending() # flush queued unregister / close calls
+
 def main():
     parser = argparse.ArgumentParser(description="ZMQ Publisher/Subscriber CLI")
-    parser.add_argument("mode", choices=["pub", "sub"], help="Mode: 'pub' to publish, 'sub' to subscribe")
-    parser.add_argument("transport", type=str, choices=[t.name for t in Transport],
-                        help="Transport method: TCP, UDP, INPROC, IPC")
-    parser.add_argument("endpoint", type=str, choices=[e.name for e in Endpoint],
+    parser.add_argument("mode", choices=["pub", "sub", "bench"],
+                        help="Mode: 'pub' to publish, 'sub' to subscribe, 'bench' for a loopback benchmark")
+    parser.add_argument("transport", type=str, nargs="?", choices=[t.name for t in Transport],
+                        help="Transport method: TCP, UDP, INPROC, IPC (bench: limit to one, default INPROC, IPC, TCP)")
+    parser.add_argument("endpoint", type=str, nargs="?", choices=[e.name for e in Endpoint],
                         help="Endpoint to bind/connect to (choose from predefined endpoint names)")
 
     parser.add_argument("--topic", default="", help="Topic to subscribe to (default: all)")
+    parser.add_argument("--count", type=int, default=20000, help="bench: messages per run")
+    parser.add_argument("--rate", type=float, default=0, help="bench: publish rate in msgs/s (default: flat out)")
+    parser.add_argument("--encoding", action="append", choices=["ascii", "packed"],
+                        help="bench: payload encoding, repeatable (default: all)")
+    parser.add_argument("--json", action="store_true", help="bench: print results as JSON")
+    parser.add_argument("--out", help="bench: also write the JSON results to this file")
 
     args = parser.parse_args()
 
+    if args.mode == "bench":
+        from common.zmqbench import runBench, formatResults, BENCH_ENDPOINTS # zmqbench depends on this module
+        transports = [t for t in BENCH_ENDPOINTS if t.name == args.transport] # by name, __main__ has its own Transport
+        if args.transport and not transports:
+            parser.error(f"bench supports {', '.join(t.name for t in BENCH_ENDPOINTS)}")
+        results = runBench(transports=transports, encodings=args.encoding, count=args.count, rate=args.rate)
+        report = json.dumps([asdict(r) for r in results], indent=2)
+        print(report if args.json else formatResults(results))
+        if args.out:
+            with open(args.out, "w") as f:
+                f.write(report)
+        return
+
+    if args.transport is None or args.endpoint is None:
+        parser.error(f"{args.mode} requires a transport and an endpoint")
     transport = Transport[args.transport]  # Map string to the corresponding Transport Enum
     endpoint = Endpoint[args.endpoint]  # Map string to the corresponding Endpoint Enum
 
@@ -114,7 +289,7 @@ def main():
         print("Subscriber is running. Receiving messages (Ctrl+C to exit).")
         try:
             while True:
-                topic, message,_ = subscriber.receive()
+                topic, message,_ = subscriber.receive(timeout=100)
                 if topic and message:
                     print(f"{topic}: {message}")
         except KeyboardInterrupt:
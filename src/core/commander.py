@@ -1,38 +1,79 @@
+from typing import Optional
+
 from common.messages import ParameterMap, Parameter
 from common.zmqutils import ZmqPub, Endpoint, Transport
+from common.zmqasync import AsyncZmqPub
 from common.worker import Worker
 from common.logger import getmylogger
 
-class ZMQCommander():
-    def __init__(self, paramRegMapFile:str):
+def buildGetPacket(param: Parameter) -> bytes:
+    paramId = chr(param.address + ord('A')) # encode as ascii
+    # SOF | TYPE | ID | DATA(0)| EOF
+    return ("<" + "A" + paramId).encode() + b'\n'
+
+def buildSetPacket(param: Parameter, value: str) -> bytes:
+    paramId = chr(param.address + ord('A')) # encode as ascii
+    # SOF | ID | TYPE | DATA(0)| EOF
+    return ("<" + "B" + str(paramId) + str(value)).encode() + b'\n'
+
+class BaseCommander():
+    """Parameter map and publisher shared by the blocking and async commanders."""
+    def __init__(self, paramRegMapFile:str, publisher: ZmqPub | AsyncZmqPub):
         self.paramRegMap = ParameterMap()
         self.paramRegMap.loadParametersFromJSON(paramRegMapFile)
-        self.publisher = ZmqPub(endpoint=Endpoint.BOT_CMD, transport=Transport.TCP)
+        self.publisher = publisher
         self.publisher.connect()
         self.log = getmylogger(__name__)
 
-    def sendGetCmd(self,nodeID:str,  paramName :str) -> bool:
+    def getFrames(self, nodeID:str, paramName:str) -> Optional[list[bytes]]:
+        """[node, packet] of a GET, None for an unknown parameter."""
         param = self.paramRegMap.getParameterByName(nodeID,paramName)
-        if(isinstance(param, Parameter)):
-            paramId = chr(param.address + ord('A')) # encode as ascii
-            # SOF | TYPE | ID | DATA(0)| EOF
-            packet = ("<" + "A" + paramId).encode() + b'\n' 
-            self.publisher.socket.send_multipart([nodeID.encode(), packet])
-            return True
-        else:
+        return [nodeID.encode(), buildGetPacket(param)] if isinstance(param, Parameter) else None
+
+    def setFrames(self, nodeID:str, paramName:str, value:str) -> Optional[list[bytes]]:
+        """[node, packet] of a SET, None for an unknown parameter."""
+        param = self.paramRegMap.getParameterByName(nodeID,paramName)
+        return [nodeID.encode(), buildSetPacket(param, value)] if isinstance(param, Parameter) else None
+
+    def close(self):
+        self.publisher.close()
+
+class ZMQCommander(BaseCommander):
+    def __init__(self, paramRegMapFile:str, transport: Transport = Transport.TCP, endpoint: Endpoint = Endpoint.BOT_CMD):
+        super().__init__(paramRegMapFile, ZmqPub(endpoint=endpoint, transport=transport))
+
+    def sendGetCmd(self,nodeID:str,  paramName :str) -> bool:
+        frames = self.getFrames(nodeID, paramName)
+        if frames is None:
             return False
+        self.publisher.socket.send_multipart(frames)
+        return True
+
     def sendSetCmd(self, nodeID:str, paramName:str, value:str) -> bool:
-                    # SOF | TYPE | ID | DATA(0)| EOF
-        param = self.paramRegMap.getParameterByName(nodeID,paramName)
-        if(isinstance(param, Parameter)):      
-            paramId = chr(param.address + ord('A')) # encode as ascii
-            # SOF | ID | TYPE | DATA(0)| EOF
-            packet = ("<" + "B" + str(paramId) + str(value)).encode() + b'\n'
-            self.publisher.socket.send_multipart([nodeID.encode(), packet])
-            return True
-        else:
+        frames = self.setFrames(nodeID, paramName, value)
+        if frames is None:
             return False
+        self.publisher.socket.send_multipart(frames)
+        return True
 
     def sendRunCmd(self, nodeID:str, cmd:str):
         raise NotImplementedError("Not Implemented Yet")
-    
\ No newline at end of file
+
+class AsyncZMQCommander(BaseCommander):
+    """ZMQCommander for coroutines, run on AsyncLoopThread alongside other async flows. Drives ParamTableApp."""
+    def __init__(self, paramRegMapFile:str, transport: Transport = Transport.TCP, endpoint: Endpoint = Endpoint.BOT_CMD):
+        super().__init__(paramRegMapFile, AsyncZmqPub(endpoint=endpoint, transport=transport))
+
+    async def sendGetCmd(self, nodeID:str, paramName:str) -> bool:
+        frames = self.getFrames(nodeID, paramName)
+        if frames is None:
+            return False
+        await self.publisher.socket.send_multipart(frames)
+        return True
+
+    async def sendSetCmd(self, nodeID:str, paramName:str, value:str) -> bool:
+        frames = self.setFrames(nodeID, paramName, value)
+        if frames is None:
+            return False
+        await self.publisher.socket.send_multipart(frames)
+        return True
@@ -1,7 +1,7 @@
 import sys
 import numpy as np
 from collections import deque
-from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton
+from PyQt6.QtWidgets import QApplication, QMainWindow, QVBoxLayout, QWidget, QPushButton, QProgressBar
 from PyQt6.QtCore import QTimer, pyqtSlot
 from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.animation import FuncAnimation
@@ -9,7 +9,10 @@ import matplotlib.pyplot as plt
 from scipy.interpolate import CubicSpline
 
 from common.logger import getmylogger
-from client.zmqQtBridge import ZmqBridgeQt
+from client.zmqQtBridge import ZmqBridgeQt, BATCH_PERIOD_MS
+from common.telemStore import TelemetryStore
+from common.export import FigureSnapshot, ArtistSnapshot
+from client.exportService import ExportService
 from common.zmqutils import Endpoint, Transport
 from common.messages import TopicMap
 
@@ -66,8 +69,7 @@ class MapPlot(FigureCanvas):
             "TELEM/TWSB/ANGULAR_VEL": "omega",
         }
 
-        # Store data per topic
-        self.dataset = {topic: deque(maxlen=2028) for topic in self.required_topics}
+        self.historyLen = 2048 # trajectory samples drawn, read from the shared store
 
         # Latest message tracker
         self.frame_cache = {}
@@ -78,15 +80,19 @@ class MapPlot(FigureCanvas):
         topic_map = TopicMap()
         topic_map.load_topics_from_json("robotConfig.json")
 
+        self.store = TelemetryStore.instance()
+        self.store.subscribe(topic_map, self.required_topics, Transport.TCP, Endpoint.BOT_MSG,
+                             capacity=self.historyLen)
         self.zmqBridge = ZmqBridgeQt(
             topicMap=topic_map,
             transport=Transport.TCP,
-            endpoint=Endpoint.BOT_MSG
+            endpoint=Endpoint.BOT_MSG,
+            batchPeriodMs=BATCH_PERIOD_MS,
+            conflate=True # only the newest pose matters
         )
-        self.zmqBridge.subscriptions = tuple(self.required_topics)
-        self.zmqBridge.subscriber.addTopicSub("TELEM/TWSB")
-        self.zmqBridge.msgSig.connect(self._updateData)
-        self.zmqBridge.workerIO._begin()
+        self.zmqBridge.registerSubscriptions(tuple(self.required_topics))
+        self.zmqBridge.blockSig.connect(self._updateBlock)
+        self.zmqBridge.start()
 
         self.robot = MobileRobot("bot1")
 
@@ -104,16 +110,13 @@ class MapPlot(FigureCanvas):
         self.ani = FuncAnimation(self.figure, self.animate, interval=100)
 
     @pyqtSlot(tuple)
-    def _updateData(self, msg: tuple[tuple, str]):
-        topic, data = msg
+    def _updateBlock(self, blocks: tuple):
         try:
-            value = float(data)
-            self.dataset[topic].append(value)
-
-            key = self.topic_to_key.get(topic)
-            if key:
-                self.current_frame[key] = value
-
+            for block in blocks:
+                for topic, value in zip(block.names, block.data[-1].tolist()):
+                    key = self.topic_to_key.get(topic)
+                    if key:
+                        self.current_frame[key] = value
 
             # Only proceed if we have all values
             if all(k in self.current_frame for k in ["x", "y", "phi", "vel", "omega"]):
@@ -125,7 +128,7 @@ class MapPlot(FigureCanvas):
                     self.current_frame["omega"]
                 )
         except Exception as e:
-            self.log.error(f"Error in _updateData: {e}")
+            self.log.error(f"Error in _updateBlock: {e}")
 
     def update_plot(self, x, y, phi, v, omega):
         self.robot.update(x, y, phi, v, omega)
@@ -134,9 +137,9 @@ class MapPlot(FigureCanvas):
 
     def animate(self, i):
         self.robot_dot.set_data([self.robot.x_g], [self.robot.y_g])
-        if len(self.robot.prev_trajectory) > 1:
-            x_hist, y_hist = zip(*self.robot.prev_trajectory)
-            self.history_line.set_data(x_hist, y_hist)
+        aligned = self.store.lastAligned(("TELEM/TWSB/XG", "TELEM/TWSB/YG"), self.historyLen)
+        if aligned is not None and len(aligned[0]) > 1:
+            self.history_line.set_data(aligned[1], aligned[2]) # one view of the topic, rows align
 
         if len(self.robot.predicted_trajectory) > 1:
             x_pred, y_pred = zip(*self.robot.predicted_trajectory)
@@ -148,6 +151,22 @@ class MapPlot(FigureCanvas):
 
         return self.robot_dot, self.history_line, self.predicted_line
 
+    def snapshot(self) -> FigureSnapshot:
+        """Trajectory, robot and prediction for ExportService, a time-lapse replays the stored path."""
+        empty = np.empty(0)
+        ts, x_hist, y_hist = self.store.lastAligned(("TELEM/TWSB/XG", "TELEM/TWSB/YG"), self.historyLen) or (empty, empty, empty)
+        x_pred, y_pred = self.predicted_line.get_data()
+        artists = [
+            ArtistSnapshot(label="History", t=ts.copy(), x=x_hist.copy(), y=y_hist.copy(),
+                           style={"color": "g", "linestyle": "-", "linewidth": 1}),
+            ArtistSnapshot(label="Robot", t=ts.copy(), x=x_hist.copy(), y=y_hist.copy(), tail=1,
+                           style={"color": "b", "marker": "o", "markersize": 8, "linestyle": ""}),
+            ArtistSnapshot(label="Predicted", x=np.array(x_pred, dtype=np.float64), y=np.array(y_pred, dtype=np.float64),
+                           style={"color": "r", "linestyle": "--"}),
+        ]
+        return FigureSnapshot(xlabel=self.ax.get_xlabel(), ylabel=self.ax.get_ylabel(), xlim=self.ax.get_xlim(),
+                              ylim=self.ax.get_ylim(), artists=artists, figsize=(5, 5), theme="default")
+
 
 class MapApp(QMainWindow):
     def __init__(self):
@@ -164,13 +183,34 @@ class MapApp(QMainWindow):
         self.map_plot = MapPlot()
         self.saveBtn = QPushButton("Save", self)
         self.saveBtn.clicked.connect(self.handle_save)
+        self.saveProgress = QProgressBar(self)
+        self.saveProgress.hide()
+        self.exportService = ExportService()
+        self.exportService.progressSig.connect(self.handle_save_progress)
+        self.exportService.finishedSig.connect(self.handle_saved)
+        self.exportService.failedSig.connect(self.handle_save_failed)
 
         layout.addWidget(self.map_plot)
         layout.addWidget(self.saveBtn)
+        layout.addWidget(self.saveProgress)
 
     def handle_save(self):
-        self.map_plot.figure.savefig("robot_map.png")
-        print("Map saved as 'robot_map.png'")
+        # Rendered in a worker process, the map keeps updating meanwhile
+        if self.exportService.export(self.map_plot.snapshot(), "robot_map.png"):
+            self.saveProgress.setValue(0)
+            self.saveProgress.show()
+
+    def handle_save_progress(self, done: int, total: int):
+        self.saveProgress.setMaximum(total)
+        self.saveProgress.setValue(done)
+
+    def handle_saved(self, path: str):
+        self.saveProgress.hide()
+        print(f"Map saved as '{path}'")
+
+    def handle_save_failed(self, msg: str):
+        self.saveProgress.hide()
+        print(f"Map save failed: {msg}")
 
 
 if __name__ == "__main__":
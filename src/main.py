@@ -12,7 +12,7 @@ from common.messages import TopicMap, ParameterMap
 from common.config import SessionConfig, PlotAppCfg, PlotCfg, AppTypeMap, ConsoleAppCfg, ControllerCfg
 from common.zmqutils import Transport, Endpoint
 
-from core.commander import ZMQCommander
+from core.commander import ZMQCommander, AsyncZMQCommander
 
 from client.menus import FileExplorer
 from client.plot import  LinePlot, PlotApp
@@ -23,6 +23,8 @@ from client.joystick import JoystickApp
 from client.paramTable import ParamTableApp
 from client.sigGen import SigGenApp
 from client.recorder import RecorderApp
+from client.replayer import ReplayApp
+from client.diagnostics import DiagnosticsApp
 
 
 
@@ -61,7 +63,7 @@ class App(QMainWindow):
         self.joystickApp = JoystickApp(self.zmqCommander)
         self.appWindows.append(self.joystickApp)
         self.joystickApp.show()
-        self.paramTableApp = ParamTableApp(self.zmqCommander)
+        self.paramTableApp = ParamTableApp(AsyncZMQCommander(self.config.controllerAppCfg.paramRegMapFile))
         self.appWindows.append(self.paramTableApp)
         self.paramTableApp.show()
         self.sigGenApp = SigGenApp()
@@ -70,6 +72,12 @@ class App(QMainWindow):
         self.recorderApp = RecorderApp(transport=Transport.TCP, endpoint=Endpoint.BOT_MSG)
         self.appWindows.append(self.recorderApp)
         self.recorderApp.show()
+        self.replayApp = ReplayApp(transport=Transport.TCP, endpoint=Endpoint.LOCAL_MSG) # in app sinks listen here too
+        self.appWindows.append(self.replayApp)
+        self.replayApp.show()
+        self.diagnosticsApp = DiagnosticsApp()
+        self.appWindows.append(self.diagnosticsApp)
+        self.diagnosticsApp.show()
 
         self.setCentralWidget(self.paramTableApp)
 
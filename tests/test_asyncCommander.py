@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import unittest
+
+import zmq
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from common.zmqutils import Transport, Endpoint, buildAddress
+from common.zmqasync import AsyncLoopThread
+from core.commander import AsyncZMQCommander, buildGetPacket, buildSetPacket
+
+"""
+AsyncZMQCommander as driven by ParamTableApp: commands submitted to the
+AsyncLoopThread arrive on the command endpoint as [node, packet].
+"""
+
+PARAM_MAP = os.path.join(os.path.dirname(__file__), '../robotConfig.json')
+RECV_TIMEOUT_MS = 100 # per attempt, the first sends may be lost while the sub joins
+ATTEMPTS = 50
+
+class TestAsyncZMQCommander(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sub = zmq.Context.instance().socket(zmq.SUB) # bound once, an inproc address is only released on close
+        cls.sub.setsockopt(zmq.SUBSCRIBE, b"")
+        cls.sub.bind(buildAddress(Transport.INPROC, Endpoint.COMSTERM_CMD))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.sub.close(linger=0)
+
+    def setUp(self):
+        while self.sub.poll(0, zmq.POLLIN): # repeats of the previous test's command
+            self.sub.recv_multipart()
+        self.cmdr = AsyncZMQCommander(PARAM_MAP, Transport.INPROC, Endpoint.COMSTERM_CMD)
+        self.runner = AsyncLoopThread.instance()
+
+    def tearDown(self):
+        self.runner.submit(self._close()).result()
+
+    async def _close(self):
+        self.cmdr.close()
+
+    def sendUntilReceived(self, coroFactory) -> list[bytes]:
+        for _ in range(ATTEMPTS): # slow joiner
+            self.assertTrue(self.runner.submit(coroFactory()).result())
+            if self.sub.poll(RECV_TIMEOUT_MS, zmq.POLLIN):
+                return self.sub.recv_multipart()
+        self.fail("No command received")
+
+    def test_set(self):
+        param = self.cmdr.paramRegMap.getParameterByName("TWSB", "P_MODE")
+        frames = self.sendUntilReceived(lambda: self.cmdr.sendSetCmd("TWSB", "P_MODE", "1"))
+        self.assertEqual(frames, [b"TWSB", buildSetPacket(param, "1")])
+
+    def test_get(self):
+        param = self.cmdr.paramRegMap.getParameterByName("VISION", "MAX_VEL")
+        frames = self.sendUntilReceived(lambda: self.cmdr.sendGetCmd("VISION", "MAX_VEL"))
+        self.assertEqual(frames, [b"VISION", buildGetPacket(param)])
+
+    def test_unknown_param(self):
+        self.assertFalse(self.runner.submit(self.cmdr.sendSetCmd("TWSB", "NO_SUCH_PARAM", "1")).result())
+        self.assertFalse(self.runner.submit(self.cmdr.sendGetCmd("NO_SUCH_NODE", "P_MODE")).result())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from common.messages import Topic
+from common.telemHub import TelemFrame
+from common.recording import CsvRecordingWriter, RecordingManifest, SegmentCompressor, MANIFEST_EXT, zstandard
+from common.recordingReader import RecordingReader
+from common.replay import readRecording
+
+"""
+RecordingReader and readRecording over a manifest recording whose csv segment
+is plain, gzip or zstd compressed.
+"""
+
+ROWS = 1000
+TOPIC = Topic(ID="0", name="imu/TWSB", args=["x", "y", "timestamp"], nArgs=3)
+
+class TestRecordingReader(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "rec.csv")
+        writer = CsvRecordingWriter(self.filename, [TOPIC])
+        for i in range(ROWS):
+            writer.write(TelemFrame(topic=TOPIC, values=[str(i), str(-i)], timestamp=str(i * 0.01)))
+        writer.close()
+        self.manifest = RecordingManifest.open(self.filename)
+        self.segment = self.manifest.add(writer, "csv")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def compress(self, method: str):
+        SegmentCompressor(method)._compress(self.manifest, self.segment)
+        self.assertEqual(self.segment["compressed"], method)
+
+    def assertReads(self):
+        reader = RecordingReader(self.filename)
+        try:
+            t, y = reader.read("imu/TWSB", "y", 1.0, 2.0)
+        finally:
+            reader.close()
+        np.testing.assert_allclose(t, np.arange(100, 201) * 0.01)
+        np.testing.assert_allclose(y, -np.arange(100, 201))
+        self.assertEqual(len(list(readRecording(self.filename[:-4] + MANIFEST_EXT))), ROWS)
+
+    def test_shared_manifest(self):
+        reader = RecordingReader(self.filename[:-4] + MANIFEST_EXT)
+        self.assertIs(reader.manifest, self.manifest)
+        writer = CsvRecordingWriter(self.filename, [TOPIC])
+        writer.write(TelemFrame(topic=TOPIC, values=["0", "0"], timestamp="20.0"))
+        writer.close()
+        self.manifest.add(writer, "csv") # appended by the recorder after the reader opened
+        t, _ = reader.read("imu/TWSB", "y", 19.0, 21.0)
+        reader.close()
+        np.testing.assert_allclose(t, [20.0])
+
+    def test_plain(self):
+        self.assertReads()
+
+    def test_gzip(self):
+        self.compress("gzip")
+        self.assertReads()
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd(self):
+        self.compress("zstd")
+        self.assertReads()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from common.messages import TopicMap
+from common.replay import Replay
+
+"""
+Replay pacing of a recording mixing a host clock topic (seconds) and a device
+clock topic (milliseconds since boot).
+"""
+
+class NullPub():
+    def __init__(self):
+        self.sent = list()
+
+    def sendTimestamped(self, topic: str, data: str, timestamp: str):
+        self.sent.append((topic, data, timestamp))
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "rec.csv")
+        with open(self.path, 'w') as f:
+            f.write("topic,timestamp,host,dev\n")
+            for i in range(101):
+                f.write(f"host,{1700000000 + i * 0.01},{i},\n")
+                f.write(f"dev,{5000 + i * 10},,{i}\n")
+        self.topicMap = TopicMap()
+        self.topicMap.register("host", "0", ["msg", "timestamp"], ":")
+        self.topicMap.register("dev", "1", ["msg", "timestamp"], ":", timeScale=0.001)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def replayedSeconds(self, topicMap) -> float:
+        seconds = list()
+        pub = NullPub()
+        Replay(self.path, pub, speed=0, topicMap=topicMap).run(lambda sent, s: seconds.append(s))
+        self.assertEqual(len(pub.sent), 202)
+        self.assertEqual(pub.sent[1], ("dev", "0", "5000"))
+        return seconds[-1]
+
+    def test_topic_scales(self):
+        self.assertAlmostEqual(self.replayedSeconds(self.topicMap), 1.0)
+
+    def test_unscaled_device_clock(self):
+        self.assertAlmostEqual(self.replayedSeconds(None), 1000.0) # ms taken as seconds
+
+if __name__ == '__main__':
+    unittest.main()
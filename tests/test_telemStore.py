@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+from common.messages import Topic
+from common.telemStore import TopicColumns, TelemetryStore
+
+"""
+TopicColumns views and aligned field reads handed to plots while the hub keeps appending.
+"""
+
+TOPIC = Topic(ID="0", name="imu/TWSB", args=["x", "y", "timestamp"], nArgs=3)
+OTHER = Topic(ID="1", name="pose/TWSB", args=["x", "y", "timestamp"], nArgs=3)
+
+class TestTopicColumns(unittest.TestCase):
+    def setUp(self):
+        self.columns = TopicColumns(TOPIC, capacity=10, pyramid=False)
+
+    def fill(self, start: int, count: int):
+        for i in range(start, start + count):
+            self.columns.append(float(i), [str(i), str(-i)])
+
+    def test_reserved_view_outlives_appends(self):
+        n = 100
+        self.columns.reserve(n)
+        self.fill(0, n)
+        view = self.columns.view(n)
+        expected = view.copy()
+        self.fill(n, n) # the writer keeps going while the plot draws
+        np.testing.assert_array_equal(view, expected)
+
+    def test_reserve_never_shrinks(self):
+        self.columns.reserve(100)
+        capacity = self.columns.capacity
+        self.columns.reserve(10)
+        self.assertEqual(self.columns.capacity, capacity)
+
+class TestLastAligned(unittest.TestCase):
+    def setUp(self):
+        self.store = TelemetryStore(capacity=10)
+        for i in range(25):
+            self.store.append(TOPIC, float(i), [str(i), str(-i)])
+        self.store.append(OTHER, 0.0, ["0", "0"])
+
+    def test_rows_pair_up(self):
+        ts, xs, ys = self.store.lastAligned(("imu/TWSB/x", "imu/TWSB/y"), 5)
+        np.testing.assert_array_equal(ts, np.arange(20, 25))
+        np.testing.assert_array_equal(xs, -ys)
+
+    def test_fields_of_different_topics(self):
+        self.assertIsNone(self.store.lastAligned(("imu/TWSB/x", "pose/TWSB/y")))
+        self.assertIsNone(self.store.lastAligned(("imu/TWSB/x", "imu/TWSB/z")))
+
+if __name__ == '__main__':
+    unittest.main()